@@ -0,0 +1,29 @@
+"""
+Time the creation of many :class:`Branches <neuro3d.Branch>`, as done when loading
+large morphologies.
+
+Usage: python benchmarks/branches.py [branches] [repeats]
+"""
+import os, sys, time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import neuro3d
+
+
+def main(n=10 ** 6, repeats=3):
+    coords = np.zeros((4, 3))
+    radii = np.ones(4)
+    Branch = neuro3d.Branch
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(n):
+            Branch(coords, radii)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{n} branches: best {best:.3f}s of {repeats} ({best / n * 1e9:.0f}ns per branch)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,79 @@
+"""
+Time ``import neuro3d`` in fresh interpreters, and check that importing it neither
+imports ``bpy`` nor probes for a Blender binary, while the Blender backend is
+discovered through its entry point.
+
+Usage: python benchmarks/import_time.py [repeats]
+"""
+import os, sys, json, subprocess, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Registers the Blender backend entry point for checkouts that aren't installed.
+DIST_INFO = {
+    "METADATA": "Metadata-Version: 2.1\nName: neuro3d-benchmark\nVersion: 0\n",
+    "entry_points.txt": (
+        "[neuro3d.backends]\nblender = neuro3d._blender.backend:BlenderBackend\n"
+    ),
+}
+
+# Runs in the fresh interpreter: record the lookups and processes that a Blender probe
+# would need, then import neuro3d.
+CHILD = """
+import sys, json, time, shutil, subprocess
+sys.path[:0] = sys.argv[1:3]
+probes = []
+_which, _Popen = shutil.which, subprocess.Popen
+
+def which(cmd, *args, **kwargs):
+    probes.append(["which", cmd])
+    return _which(cmd, *args, **kwargs)
+
+class Popen(_Popen):
+    def __init__(self, args, *rest, **kwargs):
+        probes.append(["popen", str(args)])
+        super().__init__(args, *rest, **kwargs)
+
+shutil.which, subprocess.Popen = which, Popen
+start = time.perf_counter()
+import neuro3d
+seconds = time.perf_counter() - start
+backends = neuro3d.backend.get_backends()
+print(json.dumps({"seconds": seconds, "bpy": "bpy" in sys.modules, "probes": probes, "backends": backends}))
+"""
+
+
+def register_entry_point(path):
+    dist_info = os.path.join(path, "neuro3d_benchmark-0.dist-info")
+    os.mkdir(dist_info)
+    for name, content in DIST_INFO.items():
+        with open(os.path.join(dist_info, name), "w") as f:
+            f.write(content)
+
+
+def main(repeats=5):
+    timings = []
+    with tempfile.TemporaryDirectory() as entry_points:
+        register_entry_point(entry_points)
+        for _ in range(repeats):
+            out = subprocess.run(
+                [sys.executable, "-c", CHILD, ROOT, entry_points],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            result = json.loads(out.splitlines()[-1])
+            assert "blender" in result["backends"], "The Blender backend wasn't discovered"
+            assert not result["bpy"], "`import neuro3d` imported bpy"
+            blender = [p for p in result["probes"] if "blender" in p[1].lower()]
+            assert not blender, f"`import neuro3d` probed for Blender: {blender}"
+            timings.append(result["seconds"])
+    timings.sort()
+    print(
+        f"import neuro3d: best {timings[0]:.3f}s, median {timings[len(timings) // 2]:.3f}s"
+        f" of {repeats}, without bpy or Blender probes"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,73 @@
+"""
+Time the plot transforms of :class:`neuro3d.Plot` against the ``np.vectorize`` closures
+they replaced, and :meth:`Plot.add_trace <neuro3d.Plot.add_trace>` on the same trace,
+on the NumPy backend so that no Blender is needed.
+
+Usage: python benchmarks/traces.py [samples] [repeats]
+"""
+import os, sys, time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import neuro3d
+
+
+def use_numpy_backend():
+    try:
+        neuro3d.set_backend("numpy")
+    except neuro3d.UnknownBackendError:
+        # Running from a checkout that isn't installed, so without entry points.
+        from neuro3d.backend import _set_backend
+        from neuro3d._numpy.backend import NumpyBackend
+
+        _set_backend(NumpyBackend())
+
+
+def vectorize_baseline(plot):
+    # The per element closures that `Plot` used to build in its `__init__`.
+    w = plot._window
+    fn_f = np.vectorize(lambda t: int(round((t - w._t0) * w._a) + w._f0), otypes=[int])
+    fn_t = np.vectorize(lambda f: w._t0 + (f + w._f0) / w._a, otypes=[float])
+    fn_y = np.vectorize(lambda v: plot._origin[1] + v / plot._image[1] * plot._scale[1], otypes=[float])
+    fn_x = np.vectorize(lambda v: plot._origin[0] + plot._scale[0] / 2 + (v - w._t0) / (2 * plot._image[0]) * plot._scale[0], otypes=[float])
+    return fn_f, fn_t, fn_y, fn_x
+
+
+def best_of(repeats, f):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = f()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main(samples=10 ** 5, repeats=3):
+    use_numpy_backend()
+    t = np.linspace(0, 1000, samples)
+    signal = np.sin(t / 10) * 40 - 65
+    frames = np.arange(samples)
+    time_axis = neuro3d.time(t)
+    window = neuro3d.FrameWindow(0, 1000, 0, 1000)
+    plot = neuro3d._factorize(
+        lambda id: neuro3d.Plot((0, 0, 0), (10, 5), (50, 100), window), 0
+    )
+
+    def transform(fn_f, fn_t, fn_y, fn_x):
+        return fn_f(t), fn_t(frames), fn_y(signal), fn_x(t)
+
+    baseline, expected = best_of(repeats, lambda: transform(*vectorize_baseline(plot)))
+    current, results = best_of(
+        repeats, lambda: transform(plot.fn_f, plot.fn_t, plot.fn_y, plot.fn_x)
+    )
+    for result, expect in zip(results, expected):
+        assert np.allclose(result, expect), "Transforms differ from the baseline."
+    print(f"np.vectorize transforms of {samples} samples: best {baseline:.4f}s of {repeats}")
+    print(f"array transforms of {samples} samples: best {current:.4f}s of {repeats}")
+    print(f"speedup: {baseline / current:.1f}x")
+    elapsed, _ = best_of(repeats, lambda: plot.add_trace(signal, time_axis))
+    print(f"add_trace of {samples} samples: best {elapsed:.3f}s of {repeats}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -51,12 +51,16 @@ from .animation import encoders
 from .animation.frames import FrameWindow, time, rtime
 
 
-class Branch(BackendObject, requires=[]):
+class Branch:
     """
     A branch is a piece of uninterrupted unbranching cable used to construct
     :class:`cells <.Cell>`.
     """
 
+    # Branches are created by the hundreds of thousands, so they are plain data
+    # objects without the support checks and state tracking of a `BackendObject`.
+    __slots__ = ("_children", "_coords", "_radii", "_material", "_spline", "_cell", "_ref", "_id")
+
     def __init__(self, coords, radii, children=None, ref=None):
         """
         Create a branch.
@@ -85,6 +89,13 @@ class Branch(BackendObject, requires=[]):
         """
         return self._children
 
+    @property
+    def ref(self):
+        """
+        The reference hash that maps this branch to its data source.
+        """
+        return self._ref
+
     @property
     def coords(self):
         """
@@ -114,6 +125,15 @@ class Branch(BackendObject, requires=[]):
         else:
             return self._radii
 
+    def __getstate__(self):
+        return {k: getattr(self, k) for k in self.__slots__ if hasattr(self, k)}
+
+    def __setstate__(self, state):
+        # Branches used to be pickled with their instance `__dict__` as state.
+        for k, v in state.items():
+            if k in self.__slots__:
+                setattr(self, k, v)
+
     def to_dict(self):
         d = dict(coords=self.coords)
         if self._ref is not None:
@@ -193,6 +213,62 @@ class Cell(BackendObject, requires=["create_cell", "get_location", "set_location
         self._rotation = value
 
 
+class CellGroup(BackendObject, requires=["create_cell_group"]):
+    """
+    A group of :class:`cells <.Cell>` that are created in bulk and share their curve
+    template and material.
+    """
+
+    def __init__(
+        self,
+        morphologies,
+        positions=None,
+        rotations=None,
+        segment_subdivisions=2,
+        as_lines=False,
+        circular_subdivisions=6,
+    ):
+        """
+        Create a group of cells.
+
+        :param morphologies: A collection of root branch collections, one per cell.
+        :type morphologies: list
+        :param positions: A matrix of the 3d location of each cell.
+        :type positions: np.ndarray
+        :param rotations: A matrix of the euler rotation of each cell.
+        :type rotations: np.ndarray
+        """
+        n = len(morphologies)
+        self._positions = _as_matrix(positions, n)
+        self._rotations = _as_matrix(rotations, n)
+        self.segment_subdivisions = segment_subdivisions
+        self.as_lines = as_lines
+        self.circular_subdivisions = circular_subdivisions
+        self._cells = [
+            _create_member(Cell, roots, location=loc, rotation=rot)
+            for roots, loc, rot in zip(morphologies, self._positions, self._rotations)
+        ]
+
+    def __register__(self):
+        controller.create_cell_group(self)
+
+    def __getstate__(self):
+        return dict()
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    @property
+    def cells(self):
+        """
+        List of :class:`cells <.Cell>` in this group.
+        """
+        return self._cells.copy()
+
+
 class Plot(BackendObject, requires=["create_plot", "restore_traces"]):
     def __init__(self, origin, scale, image_scale, frame_window):
         self._origin = np.array(origin)
@@ -201,10 +277,37 @@ class Plot(BackendObject, requires=["create_plot", "restore_traces"]):
         self._window = frame_window
         self._traces = []
         self._fw = int(image_scale[0] * 2 * frame_window._a)
-        self.fn_f = np.vectorize(lambda t: int(round((t - self._window._t0) * self._window._a) + self._window._f0), otypes=[int])
-        self.fn_t = np.vectorize(lambda f: self._window._t0 + (f + self._window._f0) / self._window._a, otypes=[float])
-        self.fn_y = np.vectorize(lambda v: self._origin[1] + v / self._image[1] * self._scale[1], otypes=[float])
-        self.fn_x = np.vectorize(lambda w: self._origin[0] + self._scale[0] / 2 + (w - self._window._t0) / (2 * self._image[0]) * self._scale[0], otypes=[float])
+        # Slopes of the affine transforms from signal to plot coordinates
+        self._x_slope = self._scale[0] / (2 * self._image[0])
+        self._y_slope = self._scale[1] / self._image[1]
+
+    def fn_f(self, t):
+        """
+        Frame of the given time(s).
+        """
+        w = self._window
+        return np.rint((np.asarray(t) - w._t0) * w._a).astype(int) + w._f0
+
+    def fn_t(self, f):
+        """
+        Time of the given frame(s).
+        """
+        w = self._window
+        return w._t0 + (np.asarray(f) + w._f0) / w._a
+
+    def fn_y(self, v):
+        """
+        Plot y coordinate of the given signal value(s).
+        """
+        return self._origin[1] + np.asarray(v) * self._y_slope
+
+    def fn_x(self, w, t=None):
+        """
+        Plot x coordinate of the given time(s), when the window is centered on ``t``.
+        """
+        if t is None:
+            t = self._window._t0
+        return self._origin[0] + self._scale[0] / 2 + (np.asarray(w) - t) * self._x_slope
 
     def __register__(self):
         controller.create_plot(self)
@@ -213,6 +316,37 @@ class Plot(BackendObject, requires=["create_plot", "restore_traces"]):
         if encoder is not None:
             signal, time = encoder.encode(signal, time)
         self._traces.append(Scatter(self, signal, time, color=color))
+        # Mutating `_traces` in place isn't caught by `__setattr__`
+        self._n3d_dirty = True
+
+    def add_traces(self, signals, time, encoder=None, color=None):
+        """
+        Add many traces that share a time axis at once. The traces are stored together
+        in a single curve.
+
+        :param signals: A matrix with a signal per row.
+        :param time: The time signal shared by all signals. The encoder should not
+            alter the time axis differently for each signal.
+        """
+        if not len(signals):
+            raise ValueError("Can't add traces without any signals.")
+        if encoder is not None:
+            encoded = [encoder.encode(signal, time) for signal in signals]
+            signals = [signal for signal, _ in encoded]
+            time = encoded[0][1]
+        if len({len(signal) for signal in signals}) > 1:
+            raise ValueError("Can't add traces of different lengths to a shared time axis.")
+        self._traces.append(ScatterGroup(self, signals, time, color=color))
+        self._n3d_dirty = True
+
+    def rasterize(self, prefix, width, height, **kwargs):
+        """
+        Render the traces of this plot to an image sequence, without the backend. See
+        :func:`~.animation.raster.rasterize_plot`.
+        """
+        from .animation.raster import rasterize_plot
+
+        return rasterize_plot(self, prefix, width, height, **kwargs)
 
     def __getstate__(self):
         oc = [t._curve for t in self._traces]
@@ -221,17 +355,44 @@ class Plot(BackendObject, requires=["create_plot", "restore_traces"]):
         s = super().__getstate__()
         for t, c in zip(self._traces, oc):
             t._curve = c
+        return s
 
     def __restore__(self):
         controller.restore_traces(self)
         print("Retoring self, restored curves", self._traces[0]._curve)
 
 
+def _trace_state(trace):
+    # Signals are pickled as arrays, so that they are stored out-of-band in the sidecar
+    # files instead of inside the scene state.
+    state = trace.__dict__.copy()
+    state["_signals"] = np.asarray(trace._signals, dtype=float)
+    if isinstance(trace._time, (list, tuple)):
+        state["_time"] = np.asarray(trace._time, dtype=float)
+    return state
+
+
 class Scatter(RequiresSupport, requires=["create_scatter"]):
     def __init__(self, plot, signal, time, **kwargs):
         self._plot = plot
+        self._signals = [signal]
+        self._time = time
+        self._color = kwargs.get("color")
         self._curve = controller.create_scatter(self, signal, time, **kwargs)
 
+    __getstate__ = _trace_state
+
+
+class ScatterGroup(RequiresSupport, requires=["create_scatter_group"]):
+    def __init__(self, plot, signals, time, **kwargs):
+        self._plot = plot
+        self._signals = signals
+        self._time = time
+        self._color = kwargs.get("color")
+        self._curve = controller.create_scatter_group(self, signals, time, **kwargs)
+
+    __getstate__ = _trace_state
+
 def create_branch(*args, **kwargs):
     """
     Create a new :class:`.Branch`.
@@ -250,6 +411,18 @@ def create_cell(roots):
     cell = Cell(roots)
     return cell
 
+def create_cell_group(morphologies, positions=None, rotations=None, **kwargs):
+    """
+    Create a new :class:`.CellGroup` of cells from the given morphologies.
+
+    :param morphologies: Collection of root branch collections, one per cell.
+    :type morphologies: iterable
+    :param positions: Nx3 matrix of cell locations.
+    :param rotations: Nx3 matrix of cell euler rotations.
+    """
+    return CellGroup(list(morphologies), positions, rotations, **kwargs)
+
+
 def require(id):
     def fetch(f):
         print("Executing fetch")
@@ -272,17 +445,42 @@ def get(id):
     return controller.find(id)
 
 
+def get_ref(ref):
+    """
+    Find the cell, branch and spline index that a :attr:`Branch.ref <.Branch.ref>`
+    maps to.
+    """
+    return controller.find_ref(ref)
+
+
+def _as_matrix(data, n):
+    if data is None:
+        return np.zeros((n, 3))
+    return np.array(data, dtype=float).reshape(n, 3)
+
+
+def _create_member(cls, *args, **kwargs):
+    # Members of a group are part of the group's factory product, so they skip
+    # `BackendObject.__new__` and aren't registered as products themselves.
+    obj = object.__new__(cls)
+    obj.__init__(*args, **kwargs)
+    return obj
+
+
 def _factorize(factory, id):
     # `factorize` runs a factory method and will require exactly 1 instance of
     # a child of `BackendObject` to be created during the factory call. Inside
     # the `__new__` call the product will be registered with the controller and
-    # if the instance has a registration hook, that will be called as well.
-    backend = get_backend()
+    # if the instance has a registration hook, that will be called as soon as its
+    # `__init__` has finished.
     controller._factory_id = id
     controller._factory_product = None
-    obj = factory(id)
-    if controller._factory_product is None:
+    try:
+        obj = factory(id)
+        product = controller._factory_product
+    finally:
+        controller._factory_id = None
+        controller._factory_product = None
+    if product is None:
         warnings.warn("Factory call did not produce a backend object.")
-    controller._factory_id = None
-    controller._factory_product = None
     return obj
@@ -0,0 +1,13 @@
+# Remote controller server. This file is executed as a script inside Blender.
+#
+# Usage: blender -b [file] --python _server.py -- <package dir> <address> <authkey>
+import sys
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1 :]
+    package, address, authkey = argv
+    if package not in sys.path:
+        sys.path.insert(0, package)
+    from neuro3d._blender.remote import serve
+
+    serve(address, bytes.fromhex(authkey))
@@ -10,16 +10,20 @@ from bpy.types import (
 
 
 @bpy.app.handlers.persistent
-def save_state(_):
+def save_state(filepath):
     from .. import controller
 
+    # Newer Blender versions pass the path of the file being saved, required to put
+    # the sidecar files next to it on "Save As".
+    if not isinstance(filepath, str):
+        filepath = None
     try:
-        controller.state._save()
+        controller.state._save(filepath)
     except ReferenceError:
         # Sometimes the scene reference is invalid, manipulate it and try again.
         controller._scene = bpy.context.scene
         controller.state._scene = bpy.context.scene
-        controller.state._save()
+        controller.state._save(filepath)
 
 
 class StatePickle(PropertyGroup):
@@ -1,12 +1,88 @@
 from ..render import BackendRender
 from neuro3d.backend import Backend
-import functools, subprocess
+from ..exceptions import *
+import os, json, shutil, functools, subprocess
 
 class BlenderRender(BackendRender):
+    output = "//render/animation_####.png"
+
+    def _blender(self, *args):
+        # Blender command line, with the thread count before the render arguments.
+        threads = () if self.threads is None else ("-t", str(self.threads))
+        return self._pinned(["blender", "-b", self.file, *threads, "-E", "BLENDER_EEVEE", *args])
+
     def render_portion(self, rank, size):
+        return subprocess.run(
+            self._blender("-s", str(rank + 1), "-j", str(size), "-o", self.output, "-a")
+        ).returncode
+
+    def render_frames(self, frames, log=None):
+        frame_list = ",".join(str(f) for f in frames)
+        command = self._blender("-o", self.output, "-f", frame_list)
+        if log is None:
+            return subprocess.run(command).returncode
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True) as process:
+            for line in process.stdout:
+                log(line)
+        return process.returncode
+
+    def create_log_parser(self):
+        from ..render.telemetry import BlenderLogParser
+
+        return BlenderLogParser()
+
+    def get_output(self, frame):
         import os
 
-        os.system(f"blender -b {self.file} -E BLENDER_EEVEE -s {rank + 1} -j {size} -o //render/animation_####.png -a")
+        # Resolve the `//` relative path and `####` frame padding like Blender does.
+        root = os.path.dirname(os.path.abspath(self.file))
+        path = self.output[2:].replace("####", f"{frame:04d}")
+        return os.path.join(root, *path.split("/"))
+
+    def worker_command(self, host, port, authkey):
+        from ..render.workers import WORKER_SCRIPT
+
+        return self._blender("--python", WORKER_SCRIPT, "--", "blender", host, str(port), authkey)
+
+    def render_tile(self, frame, border, path):
+        from ..render.tiles import TILE_SCRIPT
+
+        args = [str(frame), *(str(float(b)) for b in border), path]
+        return subprocess.run(self._blender("--python", TILE_SCRIPT, "--", *args)).returncode
+
+    def get_fingerprints(self, frames):
+        import os, json, tempfile
+        from ..render.cache import FINGERPRINT_SCRIPT
+
+        frames = list(frames)
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "fingerprints.json")
+            subprocess.run(
+                [
+                    "blender", "-b", self.file, "--python", FINGERPRINT_SCRIPT,
+                    "--", output, ",".join(str(f) for f in frames),
+                ],
+                capture_output=True,
+            )
+            try:
+                with open(output) as f:
+                    fingerprints = json.load(f)
+            except FileNotFoundError:
+                raise RenderError(f"Could not fingerprint the frames of '{self.file}'.") from None
+        return {int(frame): fp for frame, fp in fingerprints.items()}
+
+    def get_frame_range(self):
+        expr = "import bpy; s = bpy.context.scene; print('n3d_frame_range', s.frame_start, s.frame_end)"
+        out = subprocess.run(
+            ["blender", "-b", self.file, "--python-expr", expr],
+            capture_output=True,
+            text=True,
+        ).stdout
+        for line in out.splitlines():
+            if line.startswith("n3d_frame_range"):
+                _, start, stop = line.split()
+                return int(start), int(stop)
+        raise RuntimeError(f"Could not determine the frame range of '{self.file}'.")
 
 class BlenderBackend(Backend):
     name = "blender"
@@ -23,12 +99,7 @@ class BlenderBackend(Backend):
 
     @property
     def available(self):
-        try:
-            subprocess.run(["blender", "--version"], capture_output=True, timeout=3)
-        except subprocess.CalledProcessError:
-            return False
-        else:
-            return True
+        return self._inside or _probe_blender(shutil.which("blender"))
 
     @property
     def priority(self):
@@ -41,12 +112,54 @@ class BlenderBackend(Backend):
 
             return BlenderController()
         else:
-            raise NotImplementedError("Remote Blender controller not implemented yet.")
+            from .remote import RemoteBlenderController
+
+            return RemoteBlenderController()
 
     def get_properties(self):
+        if not self._inside:
+            from . import remote
+
+            return remote
         from . import properties
 
         return properties
 
     def get_renderer(self):
         return BlenderRender
+
+
+def _get_probe_cache_path():
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "neuro3d", "blender_probes.json")
+
+
+@functools.lru_cache()
+def _probe_blender(path):
+    # Check whether the Blender binary at `path` runs. The result is cached on disk per
+    # binary, and probed again when the binary is modified.
+    if path is None:
+        return False
+    path = os.path.realpath(path)
+    key = f"{path}:{os.stat(path).st_mtime_ns}"
+    cache_path = _get_probe_cache_path()
+    try:
+        with open(cache_path) as f:
+            probes = json.load(f)
+    except (OSError, ValueError):
+        probes = {}
+    if key in probes:
+        return probes[key]
+    try:
+        available = not subprocess.run([path, "--version"], capture_output=True, timeout=10).returncode
+    except (OSError, subprocess.TimeoutExpired):
+        available = False
+    probes = {k: v for k, v in probes.items() if not k.startswith(f"{path}:")}
+    probes[key] = available
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(probes, f)
+    except OSError:
+        pass
+    return available
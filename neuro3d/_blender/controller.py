@@ -5,13 +5,18 @@ except ImportError:
     raise ImportError("`neuro3d._blender` can only be imported inside Blender.") from None
 
 from .curve_container import CurveContainer, _get_curve_template, _get_default_color
+from .sidecar import SidecarRef, SidecarStorage, get_sidecar_path
 from neuro3d.backend import Controller
+from neuro3d.animation.sweep import PhaseSweep, sort_keyframes
 from neuro3d.exceptions import *
-import warnings, functools, pickle, base64, numpy as np, itertools
+import warnings, functools, contextlib, collections, pickle, base64, numpy as np, itertools
 
 
 def _load(obj):
-    return pickle.loads(base64.b64decode(obj))
+    obj = pickle.loads(base64.b64decode(obj))
+    if isinstance(obj, SidecarRef):
+        obj = obj.load(get_sidecar_path(bpy.data.filepath))
+    return obj
 
 
 def _dump(obj):
@@ -43,6 +48,52 @@ def _create_spline(curve, nurbs, radii, type="POLY"):
     line.points.foreach_set("radius", radii)
     line.points.foreach_set("co", nurbs.ravel())
 
+def _animation_actions(block):
+    animation_data = getattr(block, "animation_data", None)
+    if animation_data is not None and animation_data.action is not None:
+        yield animation_data.action
+
+
+def _owned_datablocks(block, owned=None):
+    # Collect a datablock and every datablock that only exists to serve it: object
+    # data, materials, animation actions and the contents of collections. Datablocks
+    # that fail the `owned` check are skipped, together with their own dependencies.
+    if owned is not None and not owned(block):
+        return
+    yield block
+    yield from _animation_actions(block)
+    if isinstance(block, bpy.types.Collection):
+        for child in itertools.chain(block.objects, block.children):
+            yield from _owned_datablocks(child, owned)
+    elif isinstance(block, bpy.types.Object):
+        if block.data is not None:
+            yield from _owned_datablocks(block.data, owned)
+    elif isinstance(block, bpy.types.Material):
+        if block.node_tree is not None:
+            yield from _animation_actions(block.node_tree)
+    else:
+        for mat in getattr(block, "materials", ()):
+            if mat is not None:
+                yield from _owned_datablocks(mat, owned)
+
+
+def _removable_datablocks(blocks):
+    """
+    The given datablocks and the datablocks that only they use. Shared datablocks,
+    like the material of a cell group, are kept unless all of their users are part
+    of the removal.
+    """
+    blocks = set(blocks)
+    users = collections.Counter()
+    for block in blocks:
+        users.update(_owned_datablocks(block))
+
+    def owned(block):
+        return block in blocks or users[block] >= block.users
+
+    return set(itertools.chain.from_iterable(_owned_datablocks(b, owned) for b in blocks))
+
+
 class SceneState:
     def __new__(cls, scene=None):
         if scene and scene.neuro3d.pickle:
@@ -52,59 +103,194 @@ class SceneState:
 
     def __init__(self, scene):
         self._scene = scene
+        self._sidecar_path = get_sidecar_path(bpy.data.filepath)
         # If `_objects` is already set then we were loaded from a pickle
         if getattr(self, "_objects", False):
-            for k, v in list(self._objects.items()):
-                try:
-                    self._objects[k] = self._obj_from_pickle(v)
-                except KeyError:
-                    warnings.warn(f"Couldn't find obj {k} '{v}'.")
-                    del self._objects[k]
-                    continue
+            # Objects are only unpickled and restored when they are first used.
+            self._objects = {
+                k: _LazyObject(self, k, name) for k, name in self._objects.items()
+            }
             self._next_object_id = max(self._objects.keys(), default=0) + 1
         else:
             self._objects = {}
             self._next_object_id = 0
+        # Maps branch refs to (id, group member, branch index, spline index)
+        if not hasattr(self, "_refs"):
+            self._refs = {}
 
-    def _obj_from_pickle(self, name):
+    def _lookup(self, name):
         if name.startswith("::"):
-            name = name[2:]
-            parent = self._scene.collection.children
+            return self._scene.collection.children[name[2:]]
         else:
-            parent = self._scene.collection.objects
-        return BlenderController.get_n3d(parent[name])
+            return self._scene.collection.objects[name]
+
+    def _obj_from_pickle(self, name):
+        return BlenderController.get_n3d(self._lookup(name))
 
+    def _resolve(self, id):
+        obj = self._objects[id]
+        if isinstance(obj, _LazyObject):
+            try:
+                obj = self._obj_from_pickle(obj._n3d_name)
+            except KeyError:
+                warnings.warn(f"Couldn't find obj {id} '{obj._n3d_name}'.")
+                del self._objects[id]
+                raise IdMissingError("id %id% is not registered.", id) from None
+            except OSError as e:
+                # The sidecar files of the object are missing or unreadable.
+                warnings.warn(f"Couldn't load obj {id} '{obj._n3d_name}': {e}")
+                del self._objects[id]
+                raise IdMissingError("id %id% is not registered.", id) from None
+            self._objects[id] = obj
+        return obj
 
-    def _save(self):
+    def _save(self, filepath=None):
+        path = get_sidecar_path(filepath or bpy.data.filepath)
+        storage = SidecarStorage(path) if path is not None else None
+        # When saved to another location all sidecar files have to be written anew.
+        moved = path != self._sidecar_path
+        keep = set()
+        for k, o in list(self._objects.items()):
+            try:
+                if moved:
+                    o = self._resolve(k)
+                # Only objects that changed since the last save are pickled again.
+                if moved or o._n3d_dirty or "_n3d_pickle" not in o._backend_obj:
+                    # Large buffers go to the sidecar, only a small reference to
+                    # them is stored in Blender.
+                    ref = o if storage is None else storage.dump(o, k)
+                    o._backend_obj["_n3d_pickle"] = _dump(ref)
+                    o._backend_obj["_n3d_sidecar"] = getattr(ref, "file", None) or ""
+                    o._n3d_dirty = False
+                keep.add(o._backend_obj.get("_n3d_sidecar"))
+            except (ReferenceError, KeyError, IdMissingError):
+                # Object has been removed, don't store it.
+                self._objects.pop(k, None)
+        self._sidecar_path = path
         self._scene.neuro3d.pickle = _dump(self)
+        if storage is not None:
+            storage.collect(keep)
 
     def __getstate__(self):
-        state = {k: v for k, v in self.__dict__.items() if k not in ("_objects", "_scene")}
+        state = {
+            k: v
+            for k, v in self.__dict__.items()
+            if k not in ("_objects", "_scene", "_sidecar_path")
+        }
         obj_state = {}
         for k, o in list(self._objects.items()):
             try:
-                o._backend_obj["_n3d_pickle"] = _dump(o)
-            except ReferenceError:
+                name = o._backend_obj.name
+            except (ReferenceError, KeyError):
                 # Object has been removed, don't store it.
                 del self._objects[k]
                 continue
-            else:
-                name = o._backend_obj.name
-                if isinstance(o._backend_obj, bpy.types.Collection):
-                    name = "::" + name
-                obj_state[k] = name
+            if isinstance(o._backend_obj, bpy.types.Collection):
+                name = "::" + name
+            obj_state[k] = name
         state["_objects"] = obj_state
         return state
 
 
+class _LazyObject:
+    """
+    Placeholder for a registered object that hasn't been unpickled yet. It is
+    resolved on the first attribute access or :meth:`BlenderController.find`.
+    """
+
+    # Unresolved objects are in sync with their pickle.
+    _n3d_dirty = False
+
+    def __init__(self, state, id, name):
+        object.__setattr__(self, "_n3d_state", state)
+        object.__setattr__(self, "_n3d_id", id)
+        object.__setattr__(self, "_n3d_name", name)
+
+    @property
+    def _backend_obj(self):
+        # Looking up the Blender object doesn't require unpickling.
+        return self._n3d_state._lookup(self._n3d_name)
+
+    def __getattr__(self, attr):
+        return getattr(self._n3d_state._resolve(self._n3d_id), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._n3d_state._resolve(self._n3d_id), attr, value)
+
+
 _controller = None
 
 
+class _Batch:
+    """
+    Scene links, transforms and keyframes queued by :meth:`BlenderController.batch`.
+    """
+
+    def __init__(self):
+        self.links = []
+        self.transforms = {}
+        self.keyframes = {}
+
+    def apply(self):
+        # Collections first, so that objects are linked into a complete hierarchy.
+        links = sorted(self.links, key=lambda l: not isinstance(l[1], bpy.types.Collection))
+        for collection, child in links:
+            if isinstance(child, bpy.types.Collection):
+                collection.children.link(child)
+            else:
+                collection.objects.link(child)
+        for (obj, attr), value in self.transforms.items():
+            setattr(obj, attr, value)
+        for (struct, prop), keys in self.keyframes.items():
+            frames = np.array([f for f, _ in keys], dtype=float)
+            values = np.array([v for _, v in keys], dtype=float).reshape(len(keys), -1)
+            setattr(struct, prop, keys[-1][1])
+            _keyframe_values(struct.id_data, struct.path_from_id(prop), frames, values)
+
+
+def _keyframe(struct, prop, frame, value):
+    """
+    Set a property and keyframe it, or queue the keyframe while the controller batches.
+    """
+    batch = getattr(_controller, "_batch", None)
+    if batch is None:
+        setattr(struct, prop, value)
+        struct.keyframe_insert(data_path=prop, frame=frame)
+    else:
+        batch.keyframes.setdefault((struct, prop), []).append((frame, value))
+
+
+def _keyframe_values(id, data_path, frames, values):
+    # Keyframe each component of a property, with 1 bulk `foreach_set` per new fcurve.
+    # Like repeated keyframe inserts, later keys replace earlier keys on the same frame.
+    frames, last = np.unique(frames[::-1], return_index=True)
+    values = values[::-1][last]
+    if id.animation_data is None:
+        id.animation_data_create()
+    action = id.animation_data.action
+    if action is None:
+        action = id.animation_data.action = bpy.data.actions.new(id.name)
+    for index in range(values.shape[1]):
+        fcurve = action.fcurves.find(data_path, index=index)
+        if fcurve is None:
+            fcurve = action.fcurves.new(data_path, index=index)
+            kps = fcurve.keyframe_points
+            kps.add(len(frames))
+            co = np.column_stack((frames, values[:, index]))
+            kps.foreach_set("co", co.astype(np.float32).ravel())
+        else:
+            for frame, value in zip(frames, values[:, index]):
+                fcurve.keyframe_points.insert(frame, value, options={"FAST"})
+        fcurve.update()
+
+
 class BlenderController(Controller):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         global _controller
         _controller = self
+        self._batch = None
+
     @property
     @functools.lru_cache()
     def state(self):
@@ -120,10 +306,46 @@ class BlenderController(Controller):
             self._scene = bpy.context.scene
         return bpy.context.scene
 
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Queue scene links, transforms and keyframes until the end of the block, and
+        then apply them grouped by type, followed by a single view layer update.
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = batch = _Batch()
+        try:
+            yield
+        finally:
+            self._batch = None
+            batch.apply()
+            bpy.context.view_layer.update()
+
+    def _link(self, collection, child):
+        if self._batch is not None:
+            self._batch.links.append((collection, child))
+        elif isinstance(child, bpy.types.Collection):
+            collection.children.link(child)
+        else:
+            collection.objects.link(child)
+
+    def _transform(self, obj, attr, value=None):
+        # Get or set a transform of a Blender object, deferred while batching.
+        if self._batch is None:
+            if value is None:
+                return getattr(obj, attr)
+            setattr(obj, attr, value)
+        elif value is None:
+            return self._batch.transforms.get((obj, attr), getattr(obj, attr))
+        else:
+            self._batch.transforms[(obj, attr)] = value
+
     def find(self, id):
         if id not in self.state._objects:
             raise IdMissingError("id %id% is not registered.", id)
-        return self.state._objects[id]
+        return self.state._resolve(id)
 
     def register_object(self, obj, id=None):
         if id is None:
@@ -139,20 +361,106 @@ class BlenderController(Controller):
         obj._id = id
         return id
 
+    def remove(self, obj):
+        self.remove_many([obj])
+
+    def remove_many(self, objects):
+        """
+        Remove neuro3d objects and all of the Blender datablocks they own in a single
+        batch, and unregister them from the scene state.
+        """
+        objects = list(objects)
+        ids, members = set(), set()
+        for obj in objects:
+            # Group members are indexed by the id of their group and their member key.
+            member = getattr(obj, "_member_of", None)
+            if member is not None:
+                members.add(member)
+            else:
+                id = getattr(obj, "_id", None)
+                self.state._objects.pop(id, None)
+                ids.add(id)
+        self.state._refs = {
+            r: e for r, e in self.state._refs.items() if e[0] not in ids and e[:2] not in members
+        }
+        bpy.data.batch_remove(_removable_datablocks(obj._backend_obj for obj in objects))
+
+    def find_ref(self, ref):
+        """
+        Find the cell, branch and spline index that a branch ``ref`` maps to. The
+        branch is ``None`` if the cell was restored without its branches. Group members
+        aren't restored either, so for those the group itself is returned instead.
+        """
+        try:
+            id, member, branch_index, spline_index = self.state._refs[ref]
+        except KeyError:
+            raise IdMissingError("ref %id% is not indexed.", ref) from None
+        cell = self.find(id)
+        if member is not None:
+            try:
+                cell = cell._cells[member]
+            except AttributeError:
+                return cell, None, spline_index
+        try:
+            branch = cell.curve_container._branches[branch_index]
+        except AttributeError:
+            branch = None
+        return cell, branch, spline_index
+
+    def find_refs(self, refs):
+        return [self.find_ref(ref) for ref in refs]
+
+    def _index_refs(self, cell, id, member=None):
+        refs = self.state._refs
+        cc = cell.curve_container
+        for i, branch in enumerate(cc._branches):
+            if branch._ref is not None:
+                refs[branch._ref] = (id, member, i, cc.name2spline_index[str(branch)])
+
     def create_cell(self, cell):
         cc = self._create_curve_container(cell)
         _init_pos, _init_rot = cell.location, cell.rotation
         cell._backend_obj = cc._backend_obj
         cell.curve_container = cc
+        self._index_refs(cell, cell._id)
         # Trigger cell properties now that the curve container is available.
         cell.location = _init_pos
         cell.rotation = _init_rot
 
+    def create_cell_group(self, group):
+        coll = self._create_collection(group)
+        name = self.get_blender_name(group)
+        # All cells copy the settings of a single template and share 1 material.
+        template = _get_curve_template(name, group)
+        color = _get_default_color(name)
+        material = CurveContainer.create_material(name, color, 1.0)
+        for i, cell in enumerate(group._cells):
+            cc = CurveContainer(
+                cell,
+                template.copy(),
+                True,
+                color,
+                1.0,
+                container_material=material,
+                name=f"{name}_cell_{i}",
+                link=False,
+            )
+            cell._backend_obj = cc._backend_obj
+            cell.curve_container = cc
+            cell._member_of = (group._id, i)
+            self._index_refs(cell, group._id, i)
+            coll.objects.link(cc._backend_obj)
+        bpy.data.curves.remove(template)
+        # Objects are iterated in link order, so we can set all transforms at once.
+        coll.objects.foreach_set("location", group._positions.ravel())
+        coll.objects.foreach_set("rotation_euler", group._rotations.ravel())
+        self._link(self.scene.collection, coll)
+
     def create_plot(self, plot):
         coll = self._create_collection(plot)
-        self.scene.collection.children.link(coll)
+        self._link(self.scene.collection, coll)
         frame = self._create_plot_frame(plot)
-        coll.objects.link(frame)
+        self._link(coll, frame)
 
     def _create_collection(self, obj):
         obj._backend_obj = c = bpy.data.collections.new(self.get_blender_name(obj))
@@ -170,22 +478,30 @@ class BlenderController(Controller):
         return bpy.data.objects.new(name, curve)
 
     def get_rotation(self, obj):
-        return obj._backend_obj.rotation_euler
+        return self._transform(obj._backend_obj, "rotation_euler")
 
     def set_rotation(self, obj, rotation):
-        obj._backend_obj.rotation_euler = rotation
+        self._transform(obj._backend_obj, "rotation_euler", rotation)
 
     def get_location(self, obj):
-        return obj._backend_obj.location
+        return self._transform(obj._backend_obj, "location")
 
     def set_location(self, obj, location):
-        obj._backend_obj.location = location
+        self._transform(obj._backend_obj, "location", location)
 
     def _create_curve_container(self, cell):
         name = self.get_blender_name(cell)
-        return CurveContainer(
-            cell, _get_curve_template(name), True, _get_default_color(name), 1.0
+        cc = CurveContainer(
+            cell,
+            _get_curve_template(name),
+            True,
+            _get_default_color(name),
+            1.0,
+            name=name,
+            link=False,
         )
+        self._link(self.scene.collection, cc._backend_obj)
+        return cc
 
     def get_blender_name(self, obj):
         try:
@@ -203,192 +519,95 @@ class BlenderController(Controller):
         n3d_object._backend_obj = obj
         if hasattr(n3d_object, "__restore__"):
             n3d_object.__restore__()
+        # The object is in sync with its pickle until it is modified again.
+        n3d_object._n3d_dirty = False
         return n3d_object
 
     def create_scatter(self, scatter, signal, time, **curve_kwargs):
-        name = self.get_blender_name(scatter._plot) + f"_trace_{len(scatter._plot._traces)}"
-        # Get the coordinates of the scatter on the first frame
-        f0 = scatter._plot._window._f0
-        signal, time = _frame_decimate(scatter._plot._window, signal, time)
-        breakpoints, phases = _sc_frame_phases(scatter, signal, time.as_array(copy=False), f0)
-        coords = _sc_frame_to_coords(scatter, signal, time.as_array(copy=False), f0, phases=phases)
+        plot = scatter._plot
+        signal, time = _frame_decimate(plot._window, signal, time)
+        sweep = PhaseSweep(plot, signal, time.as_array(copy=False))
+        return self._create_traces(scatter, [sweep], **curve_kwargs)
+
+    def create_scatter_group(self, group, signals, time, **curve_kwargs):
+        plot = group._plot
+        # Decimation only depends on the time axis, so decimate all signals at once.
+        signals = np.asarray(signals, dtype=float)
+        signals, time = _frame_decimate(plot._window, signals.T, time)
+        # The phase thresholds only depend on the time axis as well.
+        sweep = PhaseSweep(plot, signals[:, 0], time.as_array(copy=False))
+        sweeps = [sweep.for_signal(signal) for signal in signals.T]
+        return self._create_traces(group, sweeps, **curve_kwargs)
+
+    def _create_traces(self, scatter, sweeps, **curve_kwargs):
+        # Put the traces as splines of a single curve and keyframe them all at once.
+        plot = scatter._plot
+        name = self.get_blender_name(plot) + f"_trace_{len(plot._traces)}"
+        # Get the coordinates of the traces on the first frame
+        f0 = plot._window._f0
+        initial = [sweep.coords(f0) for sweep in sweeps]
         curve = _create_curve(
             name,
             d=2,
-            splines=(
-                (
-                    np.column_stack((coords, np.ones(len(coords)))),
-                    [40] * len(coords)
-                ),
-            ),
+            splines=[
+                (np.column_stack((coords, np.ones(len(coords)))), [40] * len(coords))
+                for coords in initial
+            ],
             **curve_kwargs
         )
         obj = bpy.data.objects.new(name, curve)
-        ret = scatter._plot._backend_obj.objects.link(obj)
+        self._link(plot._backend_obj, obj)
         scatter._curve = obj
-        self._animate_scatter(scatter, signal, breakpoints, phases, coords)
+        rows = [
+            (np.full(len(p), i), p, f, l)
+            for i, (sweep, coords) in enumerate(zip(sweeps, initial))
+            for p, f, l in sweep.keyframes(coords)
+        ]
+        _animate_points(obj.data, *(np.concatenate(col) for col in zip(*rows)))
         return obj
 
-    def _animate_scatter(self, scatter, values, bp, phases, initial):
-        curve = scatter._curve
-        f0 = scatter._plot._window._f0
-        fw = scatter._plot._fw
-        lbx = scatter._plot._origin[0]
-        rbx = lbx + scatter._plot._scale[0]
-        fn_y = scatter._plot.fn_y
-        controls = _hook_spline(curve, 0, collect_in=scatter._plot._backend_obj)
-
-        def animate_transition(points, frames, locs):
-            for p, f, l in zip(points, frames, locs):
-                controls[p].location = l
-                controls[p].keyframe_insert(data_path="location", frame=f)
-
-        # Initial location of control objects
-        bl = len(bp)
-        animate_transition(np.arange(bl), np.repeat(f0, bl), initial)
-        # Transition 4 (arrival point)
-        tr4p = np.nonzero(phases < 4)[0]
-        f4 = np.take(bp, tr4p + 1, mode="clip") + fw
-        v4 = np.take(values, tr4p + 1, mode="clip")
-        loc = np.column_stack((
-            np.ones(len(tr4p)) * lbx,
-            fn_y(v4),
-            np.ones(len(tr4p)) * scatter._plot._origin[2]
-        ))
-        animate_transition(tr4p, f4, loc)
-        tr3p = np.nonzero(phases < 3)[0]
-        f3 = np.take(bp, tr3p, mode="clip") + fw
-        v3 = np.take(values, tr3p, mode="clip")
-        loc = np.column_stack((
-            np.ones(len(tr3p)) * lbx,
-            fn_y(v3),
-            np.ones(len(tr3p)) * scatter._plot._origin[2]
-        ))
-        animate_transition(tr3p, f3, loc)
-        # Transition 1 (waiting point)
-        tr1p = np.nonzero(phases == 0)[0]
-        f1 = np.take(bp, tr1p - 1, mode="clip")
-        v1 = np.take(values, tr1p - 1, mode="clip")
-        loc = np.column_stack((
-            np.ones(len(tr1p)) * rbx,
-            fn_y(v1),
-            np.ones(len(tr1p)) * scatter._plot._origin[2]
-        ))
-        animate_transition(tr1p, f1, loc)
-        tr2p = np.nonzero(phases < 2)[0]
-        f2 = np.take(bp, tr2p, mode="clip")
-        v2 = np.take(values, tr2p, mode="clip")
-        loc = np.column_stack((
-            np.ones(len(tr2p)) * rbx,
-            fn_y(v2),
-            np.ones(len(tr2p)) * scatter._plot._origin[2]
-        ))
-        animate_transition(tr2p, f2, loc)
-
-        for control in controls:
-            for fcurve in control.animation_data.action.fcurves:
-                if fcurve.data_path != "location":
-                    continue
-                for kf in fcurve.keyframe_points:
-                    kf.interpolation = "LINEAR"
-
-
     def restore_traces(self, plot):
         # TODO: Add conditional support for things that pickle and unpickle.
         for t in plot._traces:
             t._curve = plot._backend_obj.objects[t._curve]
 
-def _sc_frame_phases(scatter, points, times, fn):
-    f0 = scatter._plot._window._f0
-    t0 = scatter._plot._window._t0
-    st = scatter._plot._image[0]
-    a = scatter._plot._window._a
-    fw = st * 2 * a
-    f = np.vectorize(lambda t: int(round((t - t0) * a) + f0), otypes=[int])
-
-    eb = f(times - st)
-    fases = np.ones(eb.shape, dtype=int) * -1
-    if4 = np.empty(eb.shape, dtype=bool)
-    if0 = np.empty(eb.shape, dtype=bool)
-
-    if4[:-1] = eb[1:] + fw <= fn
-    if4[-1] = if4[-2]
-    fases[if4] = 4
-    if3 = ~if4 & (eb + fw <= fn)
-    fases[if3] = 3
-    if2 = (eb <= fn) & (eb + fw > fn)
-    fases[if2] = 2
-    if0[1:] = eb[:-1] > fn
-    if0[0] = if0[1]
-    fases[if0] = 0
-    if1 = ~if0 & (eb >= fn)
-    fases[if1] = 1
-    return eb, fases
-
-def _sc_frame_to_coords(scatter, points, times, frame, phases=None):
-    if phases is None:
-        _, phases = _sc_frame_phases(scatter, points, times, frame)
-    coords = np.empty((len(points), 3))
-    coords[:, 2] = scatter._plot._origin[2]
-    ox = scatter._plot._origin[0]
-    sx = scatter._plot._scale[0]
-    st = scatter._plot._image[0]
-    a = scatter._plot._window._a
-    oy = scatter._plot._origin[1]
-    sy = scatter._plot._scale[1]
-    sv = scatter._plot._image[1]
-    f0 = scatter._plot._window._f0
-    t0 = scatter._plot._window._t0
-    f = np.vectorize(lambda t: int(round((t - t0) * a) + f0), otypes=[int])
-    t = np.vectorize(lambda f: t0 + (f + f0) / a, otypes=[float])
-    y = np.vectorize(lambda v: oy + v / sv * sy, otypes=[float])
-    x = np.vectorize(lambda w: ox + sx / 2 + (w - t(frame)) / (2 * st) * sx, otypes=[float])
-    coords[phases < 2, 0] = ox + sx
-    coords[phases > 2, 0] = ox
-    coords[phases == 2, 0] = x(times[phases == 2])
-    coords[phases == 0, 1] = y(points.take(np.nonzero(phases == 0)[0] - 1, mode='clip'))
-    coords[phases == 1, 1] = y(np.interp(t0 + st, times - t(frame), points))
-    coords[phases == 2, 1] = y(points[phases == 2])
-    coords[phases == 3, 1] = y(np.interp(t0 - st, times - t(frame), points))
-    coords[phases == 4, 1] = y(points.take(np.nonzero(phases == 4)[0] + 1, mode='clip'))
-    return coords
-
-def _hook_spline(curve, spline_index, collect_in=None):
-    obj_name = curve.name
-    curve_name = curve.data.name
-    i = spline_index
-    control_objects = []
-    if collect_in is None:
-        collect_in = bpy.context.scene
-    if "hooks" in collect_in.children:
-        coll = collect_in.children["hooks"]
-    else:
-        coll = bpy.data.collections.new("hooks")
-        collect_in.children.link(coll)
-
-    bpy.context.view_layer.objects.active = curve
-    # IMPORTANT: This loop uses the `hook_assign` object operator which
-    # invalidates all of the object related pointers so we have to look them up
-    # from the root of `bpy.data` every time and cannot store local references!
-    #
-    # + General
-    bpy.ops.object.mode_set(mode="EDIT")
-    for j in range(len(curve.data.splines[i].points)):
-        point = bpy.data.curves[curve_name].splines[i].points[j]
-        hook_name = f"spline_{i}_hook{j}"
-        hook = bpy.data.objects[obj_name].modifiers.new(hook_name, "HOOK")
-        obj = bpy.data.objects.new(f"{curve.name}_spline_{i}_hook_{j}_control", None)
-        coll.objects.link(obj)
-        hook.object = obj
-        # Swap location with control point
-        bpy.data.curves[curve_name].splines[i].points[j].select = True
-        obj.location = bpy.data.curves[curve_name].splines[i].points[j].co[:3]
-        bpy.data.curves[curve_name].splines[i].points[j].co[:3] = [0, 0, 0]
-        bpy.ops.object.hook_assign(modifier=hook_name)
-        bpy.data.curves[curve_name].splines[i].points[j].select = False
-        control_objects.append(obj)
-    bpy.ops.object.mode_set(mode="OBJECT")
-    return control_objects
+
+# Enum value of the `LINEAR` keyframe interpolation, for use with `foreach_set`
+_LINEAR = 1
+
+
+def _animate_points(curve, splines, points, frames, locs):
+    """
+    Keyframe the x and y coordinates of spline points on the curve data itself, with
+    1 bulk ``foreach_set`` per fcurve instead of hooks and a keyframe insert per key.
+
+    The keyframes are given as rows of spline indices, point indices, frames and
+    locations. Like repeated keyframe inserts, later rows replace earlier rows of the
+    same point on the same frame.
+    """
+    splines, points, frames, locs = sort_keyframes(splines, points, frames, locs)
+    if not len(points):
+        return
+
+    if curve.animation_data is None:
+        curve.animation_data_create()
+    action = curve.animation_data.action
+    if action is None:
+        action = curve.animation_data.action = bpy.data.actions.new(curve.name)
+    new_point = (splines[1:] != splines[:-1]) | (points[1:] != points[:-1])
+    bounds = np.concatenate(([0], np.flatnonzero(new_point) + 1, [len(points)]))
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        data_path = f"splines[{splines[start]}].points[{points[start]}].co"
+        n = stop - start
+        for axis in range(2):
+            fcurve = action.fcurves.new(data_path, index=axis)
+            kps = fcurve.keyframe_points
+            kps.add(n)
+            co = np.column_stack((frames[start:stop], locs[start:stop, axis]))
+            kps.foreach_set("co", co.astype(np.float32).ravel())
+            kps.foreach_set("interpolation", np.full(n, _LINEAR, dtype=np.int32))
+            fcurve.update()
+
 
 def _frame_decimate(window, signal, time):
     from neuro3d import encoders
@@ -16,17 +16,17 @@ def _get_default_color(name):
     # return (0.671, 0.760, 0.440, 1)
 
 
-def _get_curve_template(name):
-    # TODO: When CellGroups are implemented the curve template should be provided by
-    # the CellGroup.
+def _get_curve_template(name, group=None):
+    # Cells that are part of a CellGroup share the curve settings of their group.
+    segment_subdivisions = getattr(group, "segment_subdivisions", 2)
+    as_lines = getattr(group, "as_lines", False)
+    circular_subdivisions = getattr(group, "circular_subdivisions", 6)
     curve_template = bpy.data.curves.new(name + "_bezier", type="CURVE")
     curve_template.dimensions = "3D"
-    curve_template.resolution_u = 2  # self.group.segment_subdivisions
+    curve_template.resolution_u = segment_subdivisions
     curve_template.fill_mode = "FULL"
-    curve_template.bevel_depth = 1.0  # 0.0 if self.group.as_lines else 1.0
-    curve_template.bevel_resolution = (
-        1.0  # int((self.group.circular_subdivisions - 4) / 2.0)
-    )
+    curve_template.bevel_depth = 0.0 if as_lines else 1.0
+    curve_template.bevel_resolution = int((circular_subdivisions - 4) / 2.0)
     # Not found in 2.91:
     # curve_template.show_normal_face = False
     # curve_template.show_handles = False
@@ -45,13 +45,16 @@ class CurveContainer:
         origin_type="center",
         closed_ends=True,
         container_material=None,
+        name=None,
+        link=True,
     ):
         from ..backend import get_backend
 
         global controller
         controller = get_backend().get_controller()
 
-        self.name = controller.get_name(cell)
+        if name is None:
+            name = controller.get_blender_name(cell)
         self.smooth_sections = smooth_sections
         self.closed_ends = closed_ends
         self.assigned_container_material = container_material
@@ -59,9 +62,10 @@ class CurveContainer:
         self.default_brightness = brightness
         self._branches = []
 
-        # copy the curve template and make a new blender object out of it
-        curve_template = _get_curve_template(self.name)
-        self._backend_obj = bpy.data.objects.new(self.name, curve_template)
+        # The curve template becomes the curve data of the new blender object, callers
+        # that share a template should pass a copy of it.
+        self._backend_obj = bpy.data.objects.new(name, curve_template)
+        self.name = self._backend_obj.name
 
         self.linked = False
         self.material_indices = []
@@ -74,7 +78,8 @@ class CurveContainer:
         for root in cell.roots:
             self.add_branch(root, recursive, in_top_level=True, origin_type=origin_type)
 
-        bpy.context.scene.collection.objects.link(self._backend_obj)
+        if link:
+            bpy.context.scene.collection.objects.link(self._backend_obj)
 
     def get_object(self):
         return bpy.data.objects.get(self.name)
@@ -102,31 +107,10 @@ class CurveContainer:
         child.lock_location = child.lock_scale = [True] * 3
 
     def remove(self):
-        self.unlink()
+        from .controller import _removable_datablocks
 
-        bl_objects = bpy.data.objects
-        ob = self.get_object()
-        object_name = ob.name
-
-        # materials
-        for mat in ob.data.materials:
-            if mat is not None:
-                # remove material animation if any
-                if mat.animation_data is not None:
-                    bpy.data.actions.remove(mat.animation_data.action)
-
-                # remove material node animation
-                if (
-                    mat.node_tree is not None
-                    and mat.node_tree.animation_data is not None
-                ):
-                    bpy.data.actions.remove(mat.node_tree.animation_data.action)
-
-                # remove material
-                bpy.data.materials.remove(mat)
-
-        # curve
-        bpy.data.curves.remove(ob.data)
+        bpy.data.batch_remove(_removable_datablocks([self.get_object()]))
+        self.linked = False
 
     @property
     def origin(self):
@@ -252,6 +236,11 @@ class CurveContainer:
 
     def add_material_to_object(self, material):
         mats = self.curve.materials
+        if material is self.assigned_container_material:
+            # Shared materials only need a single material slot.
+            for mat_idx, mat in enumerate(mats):
+                if mat == material:
+                    return mat_idx
         mats.append(material)
         mat_idx = len(mats) - 1
         return mat_idx
@@ -407,21 +396,14 @@ class CurveContainer:
             self.get_object().location = coords[0]
 
     def link(self):
-        link = bpy.context.scene.objects.link
-        bl_objects = bpy.data.objects
-
-        link(self.get_object())
+        bpy.context.scene.collection.objects.link(self.get_object())
 
         self.linked = True
 
     def unlink(self):
-        unlink_from_scene = bpy.context.scene.objects.unlink
-
-        try:
-            ob = self.get_object()
-            unlink_from_scene(ob)
-
-        except RuntimeError:
-            pass  # ignore if already unlinked
+        ob = self.get_object()
+        if ob is not None:
+            for coll in ob.users_collection:
+                coll.objects.unlink(ob)
 
         self.linked = False
@@ -1,15 +1,15 @@
 from neuro3d.animation import Property
+from .controller import _keyframe
+import numpy as np
 
 class ColorProperty(Property):
     def keyframe_insert(self, obj, frame, value):
         c = np.ones(4)
         c[0] = value
-        obj.color = c
-        obj.keyframe_insert(data_path="color", frame=frame)
+        _keyframe(obj, "color", frame, c)
 
 
 class EmissionProperty(Property):
     def keyframe_insert(self, obj, frame, value):
         emit_strength = obj.node_tree.nodes["Emission"].inputs[1]
-        emit_strength.default_value = value
-        emit_strength.keyframe_insert(data_path="default_value", frame=frame)
+        _keyframe(emit_strength, "default_value", frame, value)
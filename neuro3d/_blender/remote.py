@@ -0,0 +1,413 @@
+"""
+Remote Blender controller. Controller calls are queued on the client and sent in
+batches to a persistent ``blender -b`` server process over a local socket. NumPy
+arrays are sent as raw out-of-band buffers next to a small pickle.
+"""
+import os, atexit, pickle, secrets, socket, tempfile, threading, contextlib, subprocess
+import numpy as np
+from multiprocessing.connection import Listener, Client
+from neuro3d.backend import Controller
+from neuro3d.animation import Property
+from neuro3d.exceptions import *
+
+# Path of the script that runs the server inside Blender.
+SERVER_SCRIPT = os.path.join(os.path.dirname(__file__), "_server.py")
+# Buffers smaller than this are kept inside the pickle itself.
+_MIN_RAW_BYTES = 1024
+
+
+def send(conn, obj):
+    """
+    Send an object, with its large buffers as raw messages.
+    """
+    buffers = []
+
+    def out_of_band(buffer):
+        if buffer.raw().nbytes < _MIN_RAW_BYTES:
+            return True
+        buffers.append(buffer)
+        return False
+
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=out_of_band)
+    conn.send_bytes(len(buffers).to_bytes(4, "little") + payload)
+    for buffer in buffers:
+        conn.send_bytes(buffer.raw())
+
+
+def recv(conn):
+    """
+    Receive an object sent with :func:`send`.
+    """
+    header = conn.recv_bytes()
+    n = int.from_bytes(header[:4], "little")
+    buffers = [conn.recv_bytes() for _ in range(n)]
+    return pickle.loads(header[4:], buffers=buffers)
+
+
+class RemoteObject:
+    """
+    Handle to an object in the Blender server, by the id of the neuro3d object that
+    owns it and, for objects that are part of another object, its member key.
+    """
+
+    def __init__(self, controller, id, member=None, name=None):
+        self._controller = controller
+        self.id = id
+        self.member = member
+        self.name = name
+
+    def keyframe_insert(self, property, frame, value):
+        self._controller._queue("keyframe_insert", self.id, self.member, property, frame, value)
+
+    def __repr__(self):
+        return f"<RemoteObject {self.id}:{self.member}>"
+
+
+class _RemoteContainer:
+    # The curve container of a cell on the client side, see `CurveContainer`.
+    def __init__(self, backend_obj, branches):
+        self._backend_obj = backend_obj
+        self._branches = branches
+        self.name = backend_obj.name
+
+
+class RemoteBlenderController(Controller):
+    """
+    Controller that drives a Blender server process. Calls that don't return
+    anything are queued, and sent in batches when the queue is full, when a result
+    is needed, or on :meth:`flush`.
+    """
+
+    _factory_id = None
+    _factory_product = None
+
+    def __init__(self, blender="blender", file=None, batch_size=1000, timeout=300):
+        self.batch_size = batch_size
+        self._objects = {}
+        self._next_object_id = 0
+        self._batch = []
+        self._lock = threading.RLock()
+        authkey = secrets.token_bytes(16)
+        if hasattr(socket, "AF_UNIX"):
+            self._tmp = tempfile.mkdtemp(prefix="n3d_")
+            self._listener = Listener(
+                os.path.join(self._tmp, "controller.sock"), family="AF_UNIX", authkey=authkey
+            )
+        else:
+            self._tmp = None
+            self._listener = Listener(("localhost", 0), authkey=authkey)
+        package = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        address = self._listener.address
+        if not isinstance(address, str):
+            address = f"{address[0]}:{address[1]}"
+        command = [blender, "-b", *([file] if file else []), "--python", SERVER_SCRIPT]
+        command += ["--", package, address, authkey.hex()]
+        self._process = subprocess.Popen(command)
+        self._conn = self._accept(timeout)
+        atexit.register(self.close)
+
+    def _accept(self, timeout):
+        # `Listener.accept` can't time out, so wait for it in a thread while checking
+        # whether the server process is still alive.
+        conn = []
+        thread = threading.Thread(target=lambda: conn.append(self._listener.accept()), daemon=True)
+        thread.start()
+        waited = 0
+        while thread.is_alive():
+            thread.join(0.1)
+            waited += 0.1
+            if self._process.poll() is not None or waited > timeout:
+                self._process.kill()
+                self._close_listener()
+                raise RemoteControllerError("Blender server did not connect.")
+        return conn[0]
+
+    def _queue(self, command, *args):
+        with self._lock:
+            self._batch.append((command, args))
+            if len(self._batch) >= self.batch_size:
+                self.flush()
+
+    def _call(self, command, *args):
+        # Send the queued commands and this command, and return its result.
+        with self._lock:
+            self._batch.append((command, args))
+            return self.flush()[-1]
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Only send the commands of the block when it ends, or when a result is needed.
+        The server applies each batch it receives inside of its own controller batch.
+        """
+        if self.batch_size == float("inf"):
+            yield
+            return
+        batch_size, self.batch_size = self.batch_size, float("inf")
+        try:
+            yield
+        finally:
+            self.batch_size = batch_size
+            self.flush()
+
+    def flush(self):
+        """
+        Send the queued commands to the server and wait for them to be executed.
+
+        :returns: The results of the commands.
+        """
+        with self._lock:
+            if self._conn is None:
+                raise RemoteControllerError("The remote controller has been closed.")
+            batch, self._batch = self._batch, []
+            if not batch:
+                return []
+            try:
+                send(self._conn, batch)
+                ok, results = recv(self._conn)
+            except (EOFError, OSError) as e:
+                raise RemoteControllerError(f"Lost connection to the Blender server: {e}") from None
+            if not ok:
+                raise RemoteControllerError(f"Blender server failed: {results}")
+            return results
+
+    def save(self, filepath):
+        """
+        Save the Blender file of the server.
+        """
+        self._call("save", os.path.abspath(filepath))
+
+    def close(self):
+        if self._conn is None:
+            return
+        try:
+            self.flush()
+            send(self._conn, None)
+        except (RemoteControllerError, OSError):
+            pass
+        self._conn.close()
+        self._conn = None
+        self._close_listener()
+        try:
+            self._process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+
+    def _close_listener(self):
+        self._listener.close()
+        if self._tmp is not None:
+            try:
+                os.rmdir(self._tmp)
+            except OSError:
+                pass
+
+    def find(self, id):
+        if id not in self._objects:
+            raise IdMissingError("id %id% is not registered.", id)
+        return self._objects[id]
+
+    def register_object(self, obj, id=None):
+        if id is None:
+            id = self._next_object_id
+        elif id in self._objects:
+            raise IdTakenError("%id% is already taken by %obj%", id, self._objects[id])
+        self._objects[id] = obj
+        self._next_object_id = max(self._next_object_id, id + 1)
+        obj._id = id
+        return id
+
+    def remove(self, obj):
+        self.remove_many([obj])
+
+    def remove_many(self, objects):
+        # Objects are sent as their id and member key, so that group members resolve.
+        keys = [(obj._backend_obj.id, obj._backend_obj.member) for obj in objects]
+        for id, member in keys:
+            if member is None:
+                self._objects.pop(id, None)
+        self._queue("remove_many", keys)
+
+    def find_ref(self, ref):
+        entry = self._call("find_ref", ref)
+        if entry is None:
+            raise IdMissingError("ref %id% is not indexed.", ref)
+        id, member, branch_index, spline_index = entry
+        cell = self.find(id)
+        if member is not None:
+            cell = cell._cells[member]
+        return cell, cell.curve_container._branches[branch_index], spline_index
+
+    def find_refs(self, refs):
+        return [self.find_ref(ref) for ref in refs]
+
+    def get_name(self, obj):
+        return "n3d_obj_" + str(obj._id)
+
+    def _attach(self, cell, id, member=None, name=None):
+        cc = _RemoteContainer(RemoteObject(self, id, member, name), _iter_branches(cell))
+        cell._backend_obj = cc._backend_obj
+        cell.curve_container = cc
+
+    def create_cell(self, cell):
+        self._queue("create_cell", cell._id, cell.roots, cell.location, cell.rotation)
+        self._attach(cell, cell._id, name=self.get_name(cell))
+
+    def create_cell_group(self, group):
+        kwargs = dict(
+            segment_subdivisions=group.segment_subdivisions,
+            as_lines=group.as_lines,
+            circular_subdivisions=group.circular_subdivisions,
+        )
+        morphologies = [cell.roots for cell in group._cells]
+        self._queue(
+            "create_cell_group", group._id, morphologies, group._positions, group._rotations, kwargs
+        )
+        name = self.get_name(group)
+        group._backend_obj = RemoteObject(self, group._id, name=name)
+        for i, cell in enumerate(group._cells):
+            self._attach(cell, group._id, i, f"{name}_cell_{i}")
+
+    def create_plot(self, plot):
+        self._queue("create_plot", plot._id, plot._origin, plot._scale, plot._image, plot._window)
+        plot._backend_obj = RemoteObject(self, plot._id, name=self.get_name(plot))
+
+    def get_rotation(self, obj):
+        return self._call("get", obj._backend_obj.id, obj._backend_obj.member, "rotation")
+
+    def set_rotation(self, obj, rotation):
+        self._queue("set", obj._backend_obj.id, obj._backend_obj.member, "rotation", rotation)
+
+    def get_location(self, obj):
+        return self._call("get", obj._backend_obj.id, obj._backend_obj.member, "location")
+
+    def set_location(self, obj, location):
+        self._queue("set", obj._backend_obj.id, obj._backend_obj.member, "location", location)
+
+    def create_scatter(self, scatter, signal, time, **curve_kwargs):
+        return self._create_traces("add_trace", scatter, signal, time, curve_kwargs)
+
+    def create_scatter_group(self, group, signals, time, **curve_kwargs):
+        return self._create_traces("add_traces", group, signals, time, curve_kwargs)
+
+    def _create_traces(self, command, scatter, signals, time, curve_kwargs):
+        plot = scatter._plot
+        trace = len(plot._traces)
+        self._queue(command, plot._id, signals, time, curve_kwargs)
+        name = f"{self.get_name(plot)}_trace_{trace}"
+        return RemoteObject(self, plot._id, ("trace", trace), name)
+
+    def restore_traces(self, plot):
+        pass
+
+
+def _iter_branches(cell):
+    # Branches in the depth first order of the curve container's `_branches`.
+    branches = []
+    stack = list(reversed(cell.roots))
+    while stack:
+        branch = stack.pop()
+        branches.append(branch)
+        stack.extend(reversed(branch.children))
+    return branches
+
+
+class ColorProperty(Property):
+    def keyframe_insert(self, obj, frame, value):
+        obj.keyframe_insert("ColorProperty", frame, value)
+
+
+class EmissionProperty(Property):
+    def keyframe_insert(self, obj, frame, value):
+        obj.keyframe_insert("EmissionProperty", frame, value)
+
+
+class _Server:
+    # Executes the commands of a remote controller with the Blender controller.
+    def __init__(self):
+        import neuro3d
+
+        self._n3d = neuro3d
+        self.controller = neuro3d.controller
+
+    def _resolve(self, id, member):
+        obj = self.controller.find(id)
+        if member is None:
+            return obj
+        if isinstance(member, tuple):
+            return obj._traces[member[1]]
+        return obj._cells[member]
+
+    def _blender_obj(self, id, member):
+        obj = self._resolve(id, member)
+        return getattr(obj, "_curve", None) or obj._backend_obj
+
+    def create_cell(self, id, roots, location, rotation):
+        self._n3d._factorize(lambda id: self._n3d.Cell(roots, location, rotation), id)
+
+    def create_cell_group(self, id, morphologies, positions, rotations, kwargs):
+        n3d = self._n3d
+        n3d._factorize(lambda id: n3d.CellGroup(morphologies, positions, rotations, **kwargs), id)
+
+    def create_plot(self, id, origin, scale, image_scale, window):
+        self._n3d._factorize(lambda id: self._n3d.Plot(origin, scale, image_scale, window), id)
+
+    def add_trace(self, id, signal, time, kwargs):
+        self.controller.find(id).add_trace(signal, time, **kwargs)
+
+    def add_traces(self, id, signals, time, kwargs):
+        self.controller.find(id).add_traces(signals, time, **kwargs)
+
+    def get(self, id, member, attr):
+        return np.array(getattr(self.controller, "get_" + attr)(self._resolve(id, member)))
+
+    def set(self, id, member, attr, value):
+        getattr(self.controller, "set_" + attr)(self._resolve(id, member), value)
+
+    def keyframe_insert(self, id, member, property, frame, value):
+        obj = self._blender_obj(id, member)
+        if property == "EmissionProperty":
+            obj = obj.active_material
+        getattr(self._n3d.properties, property)().keyframe_insert(obj, frame, value)
+
+    def remove_many(self, keys):
+        self.controller.remove_many([self._resolve(id, member) for id, member in keys])
+
+    def find_ref(self, ref):
+        # Refs that aren't indexed are raised as `IdMissingError` by the client.
+        return self.controller.state._refs.get(ref)
+
+    def save(self, filepath):
+        import bpy
+
+        bpy.ops.wm.save_as_mainfile(filepath=filepath)
+
+
+def serve(address, authkey):
+    """
+    Run the commands of a remote controller until it disconnects. Every batch is
+    answered with ``(True, results)``, or ``(False, error)`` if a command failed.
+    """
+    import traceback
+
+    server = _Server()
+    family = "AF_UNIX" if ":" not in address else "AF_INET"
+    if family == "AF_INET":
+        host, port = address.rsplit(":", 1)
+        address = (host, int(port))
+    with Client(address, family=family, authkey=authkey) as conn:
+        while True:
+            try:
+                batch = recv(conn)
+            except EOFError:
+                break
+            if batch is None:
+                break
+            results = []
+            try:
+                with server.controller.batch():
+                    for command, args in batch:
+                        results.append(getattr(server, command)(*args))
+            except Exception:
+                send(conn, (False, traceback.format_exc()))
+            else:
+                send(conn, (True, results))
@@ -0,0 +1,88 @@
+import os, uuid, pickle
+import numpy as np
+
+# Buffers smaller than this are kept inside the pickle itself.
+_MIN_SIDECAR_BYTES = 4096
+# Buffers are aligned in the sidecar files so that memory mapped arrays are aligned.
+_ALIGN = 64
+
+
+def get_sidecar_path(blend_path):
+    """
+    Return the directory that holds the sidecar files of a .blend file.
+    """
+    if not blend_path:
+        return None
+    return os.path.splitext(os.path.abspath(blend_path))[0] + ".n3d"
+
+
+class SidecarRef:
+    """
+    Small reference to a pickle whose large buffers are stored in a sidecar file.
+    """
+
+    def __init__(self, file, spans, payload):
+        self.file = file
+        self.spans = spans
+        self.payload = payload
+
+    def load(self, path):
+        buffers = []
+        if self.spans:
+            # Copy-on-write memory map: arrays are paged in lazily when accessed and
+            # can be modified without touching the sidecar file.
+            mm = np.memmap(os.path.join(path, self.file), dtype=np.uint8, mode="c")
+            buffers = [mm[offset : offset + nbytes] for offset, nbytes in self.spans]
+        return pickle.loads(self.payload, buffers=buffers)
+
+
+class SidecarStorage:
+    """
+    Pickles objects with their large buffers (NumPy arrays) stored out-of-band in
+    files next to the .blend file, so that only small references are kept in the
+    Blender file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def dump(self, obj, key):
+        buffers = []
+
+        def out_of_band(buffer):
+            if buffer.raw().nbytes < _MIN_SIDECAR_BYTES:
+                return True
+            buffers.append(buffer)
+            return False
+
+        payload = pickle.dumps(obj, protocol=5, buffer_callback=out_of_band)
+        if not buffers:
+            return SidecarRef(None, [], payload)
+        os.makedirs(self.path, exist_ok=True)
+        # Every dump writes a new file, files of a previous dump may still be memory
+        # mapped by objects of this session.
+        file = f"{key}_{uuid.uuid4().hex}.bin"
+        spans = []
+        with open(os.path.join(self.path, file), "wb") as f:
+            for buffer in buffers:
+                offset = f.tell()
+                padding = -offset % _ALIGN
+                f.write(b"\0" * padding)
+                raw = buffer.raw()
+                spans.append((offset + padding, raw.nbytes))
+                f.write(raw)
+        return SidecarRef(file, spans, payload)
+
+    def collect(self, keep):
+        """
+        Remove the sidecar files that aren't in ``keep``.
+        """
+        if not os.path.isdir(self.path):
+            return
+        for file in os.listdir(self.path):
+            if file.endswith(".bin") and file not in keep:
+                try:
+                    os.remove(os.path.join(self.path, file))
+                except OSError:
+                    # Still mapped on platforms that lock mapped files, try next save.
+                    pass
@@ -0,0 +1,4 @@
+"""
+Pure NumPy backend that stores the scene as struct-of-arrays buffers, to build and
+profile scenes outside of Blender and to stand in for the Blender backend in tests.
+"""
@@ -0,0 +1,22 @@
+from neuro3d.backend import Backend
+import functools
+
+
+class NumpyBackend(Backend):
+    name = "numpy"
+    priority = False
+    available = True
+
+    def initialize(self):
+        pass
+
+    @functools.lru_cache()
+    def get_controller(self):
+        from .controller import NumpyController
+
+        return NumpyController()
+
+    def get_properties(self):
+        from . import properties
+
+        return properties
@@ -0,0 +1,247 @@
+import numpy as np
+from neuro3d.backend import Controller
+from neuro3d.animation import encoders
+from neuro3d.animation.sweep import PhaseSweep, sort_keyframes
+from neuro3d.exceptions import *
+from .scene import SceneArrays
+
+
+class NumpyObject:
+    """
+    Handle to an object row of the scene arrays.
+    """
+
+    def __init__(self, scene, index):
+        self._scene = scene
+        self.index = index
+
+    @property
+    def name(self):
+        return self._scene.names[self.index]
+
+    @property
+    def location(self):
+        return self._scene.location.array[self.index]
+
+    @location.setter
+    def location(self, value):
+        self._scene.location.array[self.index] = value
+
+    @property
+    def rotation(self):
+        return self._scene.rotation.array[self.index]
+
+    @rotation.setter
+    def rotation(self, value):
+        self._scene.rotation.array[self.index] = value
+
+    @property
+    def splines(self):
+        """
+        Indices of the splines of this object.
+        """
+        return np.flatnonzero(self._scene.spline_object.array == self.index)
+
+    @property
+    def objects(self):
+        """
+        The child objects of this object, by name.
+        """
+        children = np.flatnonzero(self._scene.parent.array == self.index)
+        return {self._scene.names[i]: NumpyObject(self._scene, i) for i in children}
+
+    def keyframe_insert(self, data_path, frame, value):
+        self._scene.add_keyframes(self.index, data_path, [frame], [value])
+
+    def get_keyframes(self, data_path):
+        return self._scene.get_keyframes(self.index, data_path)
+
+    def __repr__(self):
+        return f"<NumpyObject '{self.name}'>"
+
+
+class _Container:
+    # The spline container of a cell, like the `CurveContainer` of the Blender backend.
+    def __init__(self, backend_obj, branches, first_spline):
+        self._backend_obj = backend_obj
+        self._branches = branches
+        self.name = backend_obj.name
+        self.name2spline_index = {str(b): i for i, b in enumerate(branches)}
+        self.first_spline = first_spline
+
+
+class NumpyController(Controller):
+    """
+    Controller that builds the scene into NumPy arrays, see :class:`.SceneArrays`.
+    """
+
+    _factory_id = None
+    _factory_product = None
+
+    def __init__(self):
+        self.scene = SceneArrays()
+        self._objects = {}
+        self._refs = {}
+        self._next_object_id = 0
+
+    def find(self, id):
+        if id not in self._objects:
+            raise IdMissingError("id %id% is not registered.", id)
+        return self._objects[id]
+
+    def register_object(self, obj, id=None):
+        if id is None:
+            id = self._next_object_id
+        elif id in self._objects:
+            raise IdTakenError("%id% is already taken by %obj%", id, self._objects[id])
+        self._objects[id] = obj
+        self._next_object_id = max(self._next_object_id, id + 1)
+        obj._id = id
+        return id
+
+    def remove(self, obj):
+        self.remove_many([obj])
+
+    def remove_many(self, objects):
+        """
+        Unregister neuro3d objects. Their rows stay in the scene arrays, but are
+        detached from their parents.
+        """
+        ids, members = set(), set()
+        for obj in objects:
+            # Group members are indexed by the id of their group and their member key.
+            member = getattr(obj, "_member_of", None)
+            if member is not None:
+                members.add(member)
+            else:
+                id = getattr(obj, "_id", None)
+                self._objects.pop(id, None)
+                ids.add(id)
+            backend_obj = getattr(obj, "_backend_obj", None)
+            if backend_obj is not None:
+                self.scene.parent.array[backend_obj.index] = -1
+        self._refs = {
+            r: e for r, e in self._refs.items() if e[0] not in ids and e[:2] not in members
+        }
+
+    def find_ref(self, ref):
+        try:
+            id, member, branch_index, spline_index = self._refs[ref]
+        except KeyError:
+            raise IdMissingError("ref %id% is not indexed.", ref) from None
+        cell = self.find(id)
+        if member is not None:
+            cell = cell._cells[member]
+        return cell, cell.curve_container._branches[branch_index], spline_index
+
+    def find_refs(self, refs):
+        return [self.find_ref(ref) for ref in refs]
+
+    def _index_refs(self, cell, id, member=None):
+        for i, branch in enumerate(cell.curve_container._branches):
+            if branch._ref is not None:
+                self._refs[branch._ref] = (id, member, i, i)
+
+    def get_name(self, obj):
+        try:
+            return "n3d_obj_" + str(obj._id)
+        except AttributeError:
+            raise ValueError(f"Could not determine the name of '{obj}'.") from None
+
+    def _create_container(self, cell, index):
+        # A spline per branch, depth first like the Blender backend.
+        branches = []
+        stack = list(reversed(cell.roots))
+        while stack:
+            branch = stack.pop()
+            branches.append(branch)
+            stack.extend(reversed(branch.children))
+        splines = self.scene.add_splines(index, ((b._coords, b._radii) for b in branches))
+        return _Container(NumpyObject(self.scene, index), branches, splines.start)
+
+    def create_cell(self, cell):
+        (index,) = self.scene.add_objects(
+            [self.get_name(cell)], location=[cell.location], rotation=[cell.rotation]
+        )
+        cc = self._create_container(cell, index)
+        cell._backend_obj = cc._backend_obj
+        cell.curve_container = cc
+        self._index_refs(cell, cell._id)
+
+    def create_cell_group(self, group):
+        name = self.get_name(group)
+        (coll,) = self.scene.add_objects([name])
+        group._backend_obj = NumpyObject(self.scene, coll)
+        # All cells are added as 1 block of rows.
+        indices = self.scene.add_objects(
+            [f"{name}_cell_{i}" for i in range(len(group))],
+            parent=coll,
+            location=group._positions,
+            rotation=group._rotations,
+        )
+        for i, (cell, index) in enumerate(zip(group._cells, indices)):
+            cc = self._create_container(cell, index)
+            cell._backend_obj = cc._backend_obj
+            cell.curve_container = cc
+            cell._member_of = (group._id, i)
+            self._index_refs(cell, group._id, i)
+
+    def create_plot(self, plot):
+        name = self.get_name(plot)
+        (coll,) = self.scene.add_objects([name])
+        plot._backend_obj = NumpyObject(self.scene, coll)
+        origin, scale = plot._origin.astype(float), plot._scale
+        frame = np.tile(origin, (3, 1))
+        frame[0, 1] += scale[1]
+        frame[2, 0] += scale[0]
+        indicator = np.tile(origin, (2, 1))
+        indicator[0, 0] += scale[0] / 2
+        indicator[1, [0, 1]] += (scale[0] / 2, scale[1])
+        (index,) = self.scene.add_objects([name + "_frame"], parent=coll)
+        self.scene.add_splines(index, ((frame, 60), (indicator, 25)))
+
+    def get_rotation(self, obj):
+        return obj._backend_obj.rotation
+
+    def set_rotation(self, obj, rotation):
+        obj._backend_obj.rotation = rotation
+
+    def get_location(self, obj):
+        return obj._backend_obj.location
+
+    def set_location(self, obj, location):
+        obj._backend_obj.location = location
+
+    def create_scatter(self, scatter, signal, time, **curve_kwargs):
+        plot = scatter._plot
+        signal, time = encoders.win_decimate(plot._window).encode(signal, time)
+        sweep = PhaseSweep(plot, signal, time.as_array(copy=False))
+        return self._create_traces(scatter, [sweep])
+
+    def create_scatter_group(self, group, signals, time, **curve_kwargs):
+        plot = group._plot
+        signals = np.asarray(signals, dtype=float)
+        signals, time = encoders.win_decimate(plot._window).encode(signals.T, time)
+        sweep = PhaseSweep(plot, signals[:, 0], time.as_array(copy=False))
+        return self._create_traces(group, [sweep.for_signal(s) for s in signals.T])
+
+    def _create_traces(self, scatter, sweeps):
+        plot = scatter._plot
+        name = self.get_name(plot) + f"_trace_{len(plot._traces)}"
+        (index,) = self.scene.add_objects([name], parent=plot._backend_obj.index)
+        f0 = plot._window._f0
+        initial = [sweep.coords(f0) for sweep in sweeps]
+        splines = self.scene.add_splines(index, ((coords, 40) for coords in initial))
+        rows = [
+            (np.full(len(p), spline), p, f, l)
+            for spline, sweep, coords in zip(splines, sweeps, initial)
+            for p, f, l in sweep.keyframes(coords)
+        ]
+        keyframes = sort_keyframes(*(np.concatenate(col) for col in zip(*rows)))
+        self.scene.add_point_keyframes(*keyframes)
+        return NumpyObject(self.scene, index)
+
+    def restore_traces(self, plot):
+        objects = plot._backend_obj.objects
+        for t in plot._traces:
+            t._curve = objects[t._curve]
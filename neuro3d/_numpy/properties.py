@@ -0,0 +1,11 @@
+from neuro3d.animation import Property
+
+
+class ColorProperty(Property):
+    def keyframe_insert(self, obj, frame, value):
+        obj.keyframe_insert("color", frame, value)
+
+
+class EmissionProperty(Property):
+    def keyframe_insert(self, obj, frame, value):
+        obj.keyframe_insert("emission_strength", frame, value)
@@ -0,0 +1,158 @@
+import numpy as np
+
+
+class Buffer:
+    """
+    Growable array of rows, with amortized appends.
+    """
+
+    def __init__(self, shape=(), dtype=float):
+        self._shape = tuple(shape)
+        self._data = np.empty((16, *self._shape), dtype=dtype)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def array(self):
+        """
+        View on the rows in the buffer.
+        """
+        return self._data[: self._n]
+
+    def extend(self, rows):
+        """
+        Append rows to the buffer.
+
+        :returns: The indices of the new rows.
+        :rtype: range
+        """
+        rows = np.asarray(rows, dtype=self._data.dtype).reshape(-1, *self._shape)
+        start, stop = self._n, self._n + len(rows)
+        if stop > len(self._data):
+            data = np.empty((max(stop, 2 * len(self._data)), *self._shape), self._data.dtype)
+            data[:start] = self._data[:start]
+            self._data = data
+        self._data[start:stop] = rows
+        self._n = stop
+        return range(start, stop)
+
+
+class SceneArrays:
+    """
+    Struct-of-arrays storage of a scene: a row per object, spline, point and keyframe.
+    """
+
+    def __init__(self):
+        # Objects
+        self.names = []
+        self.parent = Buffer(dtype=int)
+        self.location = Buffer((3,))
+        self.rotation = Buffer((3,))
+        # Splines, and their points as consecutive rows
+        self.spline_object = Buffer(dtype=int)
+        self.spline_start = Buffer(dtype=int)
+        self.spline_size = Buffer(dtype=int)
+        self.point_co = Buffer((4,))
+        self.point_radius = Buffer()
+        # Keyframes of object properties, by channel
+        self.channels = {}
+        self.key_object = Buffer(dtype=int)
+        self.key_channel = Buffer(dtype=int)
+        self.key_frame = Buffer()
+        self.key_value = Buffer()
+        # Keyframes of the x and y coordinates of spline points
+        self.point_key_spline = Buffer(dtype=int)
+        self.point_key_point = Buffer(dtype=int)
+        self.point_key_frame = Buffer()
+        self.point_key_co = Buffer((2,))
+
+    def add_objects(self, names, parent=-1, location=None, rotation=None):
+        """
+        Add objects with the given names.
+
+        :returns: The indices of the new objects.
+        :rtype: range
+        """
+        n = len(names)
+        self.names.extend(names)
+        self.parent.extend(np.broadcast_to(parent, n))
+        self.location.extend(np.zeros((n, 3)) if location is None else location)
+        return self.rotation.extend(np.zeros((n, 3)) if rotation is None else rotation)
+
+    def add_splines(self, object, splines):
+        """
+        Add splines to an object, from ``(coords, radii)`` pairs.
+
+        :returns: The indices of the new splines.
+        :rtype: range
+        """
+        starts, sizes = [], []
+        for coords, radii in splines:
+            coords = np.asarray(coords, dtype=float)
+            co = np.ones((len(coords), 4))
+            co[:, : coords.shape[1]] = coords
+            starts.append(self.point_co.extend(co).start)
+            self.point_radius.extend(np.broadcast_to(radii, len(coords)))
+            sizes.append(len(coords))
+        self.spline_object.extend(np.full(len(sizes), object))
+        self.spline_start.extend(starts)
+        return self.spline_size.extend(sizes)
+
+    def add_keyframes(self, objects, data_path, frames, values):
+        """
+        Add keyframes of the ``data_path`` property of objects.
+        """
+        channel = self.channels.setdefault(data_path, len(self.channels))
+        frames = np.asarray(frames, dtype=float)
+        self.key_object.extend(np.broadcast_to(objects, frames.shape))
+        self.key_channel.extend(np.full(len(frames), channel))
+        self.key_frame.extend(frames)
+        self.key_value.extend(values)
+
+    def add_point_keyframes(self, splines, points, frames, locs):
+        """
+        Add keyframes of the x and y coordinates of spline points, given as rows of
+        spline indices, point indices, frames and locations.
+        """
+        self.point_key_spline.extend(splines)
+        self.point_key_point.extend(points)
+        self.point_key_frame.extend(frames)
+        self.point_key_co.extend(locs)
+
+    def get_points(self, spline):
+        start = self.spline_start.array[spline]
+        return self.point_co.array[start : start + self.spline_size.array[spline]]
+
+    def get_keyframes(self, object, data_path):
+        """
+        Frames and values of the keyframes of the ``data_path`` property of an object,
+        sorted by frame.
+        """
+        channel = self.channels.get(data_path)
+        mask = (self.key_object.array == object) & (self.key_channel.array == channel)
+        frames, values = self.key_frame.array[mask], self.key_value.array[mask]
+        order = np.argsort(frames, kind="stable")
+        return frames[order], values[order]
+
+    def evaluate_points(self, splines, frame):
+        """
+        Coordinates of the points of the given splines on a frame, with the keyframes
+        linearly interpolated like the Blender backend does.
+        """
+        splines = np.asarray(splines, dtype=int)
+        co = np.concatenate([self.get_points(s) for s in splines])[:, :2].copy()
+        starts = np.cumsum([0, *self.spline_size.array[splines][:-1]])
+        ks = self.point_key_spline.array
+        mask = np.isin(ks, splines)
+        ks, kp = ks[mask], self.point_key_point.array[mask]
+        kf, kco = self.point_key_frame.array[mask], self.point_key_co.array[mask]
+        # Row of each keyframe's point in `co`
+        order = np.argsort(splines)
+        rows = starts[order[np.searchsorted(splines[order], ks)]] + kp
+        for row in np.unique(rows):
+            k = rows == row
+            for axis in range(2):
+                co[row, axis] = np.interp(frame, kf[k], kco[k, axis])
+        return co
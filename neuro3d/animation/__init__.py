@@ -1,4 +1,4 @@
-from . import encoders, frames
+from . import encoders, frames, sweep, raster
 from ..exceptions import *
 import abc
 
@@ -0,0 +1,180 @@
+import os, struct, zlib, concurrent.futures
+import numpy as np
+from .sweep import PhaseSweep
+
+
+class PlotRasterizer:
+    """
+    Backend independent renderer of the sliding window traces of a :class:`.Plot` to
+    RGBA images. The plot area, from the plot's origin to its scale, is mapped onto
+    the image.
+
+    The frames are written as an image sequence (``<prefix>0001.png``, ...) that can
+    be loaded in Blender as an image sequence texture on a plane or as a compositor
+    overlay.
+    """
+
+    def __init__(
+        self,
+        plot,
+        width,
+        height,
+        color=(1, 1, 1, 1),
+        background=(0, 0, 0, 0),
+        frame_color=(1, 0, 0, 1),
+        line_width=1,
+    ):
+        self._plot = plot
+        self.width = width
+        self.height = height
+        self.color = color
+        self.background = background
+        self.frame_color = frame_color
+        self.line_width = line_width
+        self._traces = []
+        for trace in plot._traces:
+            time = trace._time
+            if hasattr(time, "as_array"):
+                time = time.as_array(copy=False)
+            sweep = PhaseSweep(plot, trace._signals[0], time)
+            for signal in trace._signals:
+                self._traces.append((sweep.for_signal(signal), trace._color))
+
+    def iter_frames(self, start=None, stop=None):
+        """
+        Iterate over the frames from ``start`` to ``stop`` and their images.
+        """
+        window = self._plot._window
+        start = window._f0 if start is None else start
+        stop = window._fn if stop is None else stop
+        sweeps = [sweep.iter_coords(start, stop) for sweep, _ in self._traces]
+        colors = [c for _, c in self._traces]
+        for frame in range(start, stop + 1):
+            image = np.empty((self.height, self.width, 4), dtype=np.uint8)
+            image[:] = _to_rgba(self.background)
+            if self.frame_color is not None:
+                self._draw_frame(image)
+            for sweep, color in zip(sweeps, colors):
+                _, coords = next(sweep)
+                self._draw_polyline(image, coords, self.color if color is None else color)
+            yield frame, image
+
+    def render_frame(self, frame):
+        return next(self.iter_frames(frame, frame))[1]
+
+    def render(self, prefix, start=None, stop=None, workers=None, format="png"):
+        """
+        Render the frames to files named ``<prefix><frame:04d>.<format>``, in parallel
+        over chunks of consecutive frames.
+
+        :param format: ``"png"`` or ``"rgba"`` for raw 8 bit RGBA bytes.
+        :returns: The paths of the written files.
+        """
+        window = self._plot._window
+        start = window._f0 if start is None else start
+        stop = window._fn if stop is None else stop
+        workers = workers or os.cpu_count()
+        bounds = np.linspace(start, stop + 1, min(workers, stop - start + 1) + 1, dtype=int)
+        os.makedirs(os.path.dirname(os.path.abspath(prefix)), exist_ok=True)
+        # Each chunk sweeps its own frames, NumPy and zlib release the GIL for the heavy
+        # lifting.
+        with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(self._render_chunk, prefix, a, b - 1, format)
+                for a, b in zip(bounds[:-1], bounds[1:])
+            ]
+            return [path for future in futures for path in future.result()]
+
+    def _render_chunk(self, prefix, start, stop, format):
+        paths = []
+        for frame, image in self.iter_frames(start, stop):
+            path = f"{prefix}{frame:04d}.{format}"
+            if format == "png":
+                write_png(path, image)
+            elif format == "rgba":
+                with open(path, "wb") as f:
+                    f.write(image.tobytes())
+            else:
+                raise ValueError(f"Unknown image format '{format}'.")
+            paths.append(path)
+        return paths
+
+    def _to_pixels(self, coords):
+        plot = self._plot
+        px = (coords[:, 0] - plot._origin[0]) / plot._scale[0] * (self.width - 1)
+        py = (coords[:, 1] - plot._origin[1]) / plot._scale[1] * (self.height - 1)
+        # Image rows go from top to bottom
+        return px, (self.height - 1) - py
+
+    def _draw_frame(self, image):
+        plot = self._plot
+        ox, oy = plot._origin[:2]
+        sx, sy = plot._scale[:2]
+        axes = np.array([[ox, oy + sy], [ox, oy], [ox + sx, oy]])
+        indicator = np.array([[ox + sx / 2, oy], [ox + sx / 2, oy + sy]])
+        self._draw_polyline(image, axes, self.frame_color)
+        self._draw_polyline(image, indicator, self.frame_color)
+
+    def _draw_polyline(self, image, coords, color):
+        px, py = self._to_pixels(coords)
+        xs, ys = _rasterize_polyline(px, py)
+        h, w = image.shape[:2]
+        r = self.line_width // 2
+        rgba = _to_rgba(color)
+        for dx in range(-r, self.line_width - r):
+            for dy in range(-r, self.line_width - r):
+                x, y = xs + dx, ys + dy
+                inside = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+                image[y[inside], x[inside]] = rgba
+
+
+def rasterize_plot(plot, prefix, width, height, start=None, stop=None, workers=None, format="png", **kwargs):
+    """
+    Render the traces of a plot to an image sequence. See :class:`.PlotRasterizer`.
+    """
+    rasterizer = PlotRasterizer(plot, width, height, **kwargs)
+    return rasterizer.render(prefix, start, stop, workers=workers, format=format)
+
+
+def _rasterize_polyline(px, py):
+    # Sample each segment at (at least) every pixel along its longest axis, all
+    # segments at once.
+    if len(px) < 2:
+        return np.rint(px).astype(int), np.rint(py).astype(int)
+    dx, dy = np.diff(px), np.diff(py)
+    n = np.ceil(np.maximum(np.abs(dx), np.abs(dy))).astype(int) + 1
+    seg = np.repeat(np.arange(len(n)), n)
+    step = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    t = step / np.repeat(np.maximum(n - 1, 1), n)
+    xs = np.rint(px[seg] + dx[seg] * t).astype(int)
+    ys = np.rint(py[seg] + dy[seg] * t).astype(int)
+    return xs, ys
+
+
+def _to_rgba(color):
+    return np.clip(np.rint(np.asarray(color, dtype=float) * 255), 0, 255).astype(np.uint8)
+
+
+def write_png(path, image):
+    """
+    Write an 8 bit RGBA image, top row first, to a PNG file. This is a minimal writer,
+    to not depend on an imaging library.
+    """
+    h, w = image.shape[:2]
+    # Every scanline is prefixed with filter type 0 (None)
+    raw = np.empty((h, w * 4 + 1), dtype=np.uint8)
+    raw[:, 0] = 0
+    raw[:, 1:] = image.reshape(h, w * 4)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 6, 0, 0, 0)))
+        f.write(png_chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        f.write(png_chunk(b"IEND", b""))
+
+
+def png_chunk(tag, data):
+    """
+    Encode a PNG chunk: its length, tag, data and checksum.
+    """
+    body = tag + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
@@ -0,0 +1,176 @@
+import copy
+import numpy as np
+
+
+class PhaseSweep:
+    """
+    Sweep-line over the sliding window phases of a plot trace.
+
+    Each point of a trace goes through 5 phases as the window slides over it: waiting
+    at the right edge (0), following the right edge (1), inside the window (2),
+    following the left edge (3) and resting at the left edge (4). The phase of a
+    point only changes at 4 threshold frames, so all phases of all frames are
+    described by ``4 * len(signal)`` sparse events.
+    """
+
+    def __init__(self, plot, signal, time):
+        self._plot = plot
+        self._signal = np.asarray(signal, dtype=float)
+        self._time = np.asarray(time, dtype=float)
+        st = plot._image[0]
+        self._fw = st * 2 * plot._window._a
+        # Event base: the frame at which a point enters the window
+        self._eb = eb = plot.fn_f(self._time - st)
+        n = len(eb)
+        self._prev = np.maximum(np.arange(n) - 1, 0)
+        self._next = np.minimum(np.arange(n) + 1, n - 1)
+        # The first frame of phase 1, 2, 3 and 4 of each point.
+        self._thresholds = np.column_stack(
+            (
+                eb[self._prev],
+                eb + 1,
+                np.ceil(eb + self._fw).astype(int),
+                np.ceil(eb[self._next] + self._fw).astype(int),
+            )
+        )
+
+    @property
+    def breakpoints(self):
+        return self._eb
+
+    def for_signal(self, signal):
+        """
+        Return a sweep of another signal on the same time axis, sharing the phase
+        thresholds of this sweep.
+        """
+        sweep = copy.copy(self)
+        sweep._signal = np.asarray(signal, dtype=float)
+        return sweep
+
+    def phases(self, frame):
+        """
+        Phase of each point on the given frame.
+        """
+        return np.count_nonzero(self._thresholds <= frame, axis=1)
+
+    def events(self, start=None, stop=None):
+        """
+        Return the frames, points and new phases of all phase changes that occur
+        after ``start`` up to and including ``stop``, sorted by frame.
+        """
+        n = len(self._eb)
+        frames = self._thresholds.T.ravel()
+        points = np.tile(np.arange(n), 4)
+        phases = np.repeat(np.arange(1, 5), n)
+        mask = np.ones(len(frames), dtype=bool)
+        if start is not None:
+            mask &= frames > start
+        if stop is not None:
+            mask &= frames <= stop
+        frames, points, phases = frames[mask], points[mask], phases[mask]
+        # Each phase's thresholds are already sorted, so a stable sort only merges the
+        # 4 runs, and keeps the highest phase last when a point skips a phase.
+        order = np.argsort(frames, kind="stable")
+        return frames[order], points[order], phases[order]
+
+    def iter_phases(self, start, stop):
+        """
+        Iterate over the phases of every frame from ``start`` to ``stop``, applying
+        the phase change events incrementally. The same array is yielded every frame
+        and updated in place.
+        """
+        phases = self.phases(start)
+        frames, points, new = self.events(start, stop)
+        bounds = np.searchsorted(frames, np.arange(start, stop + 1), side="right")
+        prev = 0
+        for frame, bound in zip(range(start, stop + 1), bounds):
+            phases[points[prev:bound]] = new[prev:bound]
+            prev = bound
+            yield frame, phases
+
+    def coords(self, frame, phases=None):
+        """
+        Plot coordinates of each point on the given frame.
+        """
+        if phases is None:
+            phases = self.phases(frame)
+        plot = self._plot
+        points, times = self._signal, self._time
+        coords = np.empty((len(points), 3))
+        coords[:, 2] = plot._origin[2]
+        ox = plot._origin[0]
+        sx = plot._scale[0]
+        st = plot._image[0]
+        t0 = plot._window._t0
+        tf = plot.fn_t(frame)
+        y = plot.fn_y
+        coords[phases < 2, 0] = ox + sx
+        coords[phases > 2, 0] = ox
+        coords[phases == 2, 0] = plot.fn_x(times[phases == 2], tf)
+        coords[phases == 0, 1] = y(points[self._prev[phases == 0]])
+        coords[phases == 1, 1] = y(np.interp(t0 + st, times - tf, points))
+        coords[phases == 2, 1] = y(points[phases == 2])
+        coords[phases == 3, 1] = y(np.interp(t0 - st, times - tf, points))
+        coords[phases == 4, 1] = y(points[self._next[phases == 4]])
+        return coords
+
+    def iter_coords(self, start, stop):
+        """
+        Iterate over the plot coordinates of every frame from ``start`` to ``stop``.
+        """
+        for frame, phases in self.iter_phases(start, stop):
+            yield frame, self.coords(frame, phases)
+
+    def transitions(self, frame):
+        """
+        Yield the transitions that points make after ``frame`` as keyframes: the
+        points, the frames at which they complete the transition and their x and
+        signal value at that time, in order of precedence.
+        """
+        phases = self.phases(frame)
+        eb, fw = self._eb, self._plot._fw
+        lbx = self._plot._origin[0]
+        rbx = lbx + self._plot._scale[0]
+        values = self._signal
+        # Transition 4 (arrival point)
+        p = np.nonzero(phases < 4)[0]
+        yield p, eb[self._next[p]] + fw, lbx, values[self._next[p]]
+        p = np.nonzero(phases < 3)[0]
+        yield p, eb[p] + fw, lbx, values[p]
+        # Transition 1 (waiting point)
+        p = np.nonzero(phases == 0)[0]
+        yield p, eb[self._prev[p]], rbx, values[self._prev[p]]
+        p = np.nonzero(phases < 2)[0]
+        yield p, eb[p], rbx, values[p]
+
+    def keyframes(self, initial):
+        """
+        Yield the keyframes of the points as rows of points, frames and x and y
+        coordinates: the ``initial`` coordinates on the first frame and then each
+        transition, in order of precedence.
+        """
+        plot = self._plot
+        f0 = plot._window._f0
+        n = len(initial)
+        yield np.arange(n), np.repeat(f0, n), initial[:, :2]
+        for p, f, x, v in self.transitions(f0):
+            yield p, f, np.column_stack((np.full(len(p), x), plot.fn_y(v)))
+
+
+def sort_keyframes(splines, points, frames, locs):
+    """
+    Sort rows of spline indices, point indices, frames and locations by spline, point
+    and frame. Like repeated keyframe inserts, later rows replace earlier rows of the
+    same point on the same frame.
+    """
+    points = np.asarray(points, dtype=int)
+    splines = np.broadcast_to(np.asarray(splines, dtype=int), points.shape)
+    frames = np.asarray(frames, dtype=float)
+    locs = np.asarray(locs, dtype=float)
+    order = np.lexsort((np.arange(len(points)), frames, points, splines))
+    splines, points = splines[order], points[order]
+    frames, locs = frames[order], locs[order]
+    new_point = (splines[1:] != splines[:-1]) | (points[1:] != points[:-1])
+    last = np.ones(len(points), dtype=bool)
+    last[:-1] = new_point | (frames[1:] != frames[:-1])
+    return splines[last], points[last], frames[last], locs[last]
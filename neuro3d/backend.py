@@ -1,13 +1,29 @@
-import pkg_resources, functools, abc, traceback
+import functools, abc, contextlib, traceback
 from .exceptions import *
 
 __set_backend = False
 _backend = None
+_controller = None
+# Classes whose requirements are supported by `_controller`, cleared when it changes.
+_supported = set()
+
+
+def _iter_entry_points(group):
+    from importlib.metadata import entry_points
+
+    try:
+        return entry_points(group=group)
+    except TypeError:
+        # Python < 3.10
+        return entry_points().get(group, [])
+
 
 @functools.lru_cache()
 def _get_backends():
+    # Backends are only constructed here, their availability is probed when they are
+    # set.
     backends = []
-    for entry_point in pkg_resources.iter_entry_points("neuro3d.backends"):
+    for entry_point in _iter_entry_points("neuro3d.backends"):
         try:
             backends.append(entry_point.load()())
         except:
@@ -31,7 +47,6 @@ def establish_backends():
     if len(prio) > 1:
         raise MultipleBackendPriorityError(", ".join(f"'{b.name}'" for b in prio) + " all claim priority as backend.", prio)
     elif len(prio):
-        print("What is?", __set_backend)
         return _set_backend(prio[0])
     # Set a fallback backend
     _set_backend(FallbackBackend())
@@ -42,19 +57,20 @@ def establish_backends():
 def _set_backend(backend):
     import neuro3d
 
-    global __set_backend, _backend
+    global __set_backend, _backend, _controller
     if __set_backend:
         raise BackendSetError(f"The backend has already been set to '{_backend.name}'")
     if not backend.available:
         raise BackendUnavailableError(f"The %backend.name% backend is not available. Available backends: " + ", ".join(f"'{b.name}'" for b in _get_backends() if b.available), backend)
+    backend.initialize()
+    controller = backend.get_controller()
+    properties = backend.get_properties()
+    # Only commit to the backend once its controller has been created.
     __set_backend = True
     _backend = backend
-    try:
-        backend.get_controller()._factory_id = None
-    except:
-        pass
-    backend.initialize()
-    neuro3d.properties = backend.get_properties()
+    _controller = neuro3d.controller = controller
+    _supported.clear()
+    neuro3d.properties = properties
 
 
 def set_backend(name):
@@ -101,6 +117,10 @@ class FallbackBackend:
 
 
 class Controller(abc.ABC):
+    # Set by `neuro3d._factorize` for the duration of a factory call.
+    _factory_id = None
+    _factory_product = None
+
     @abc.abstractmethod
     def find(self, id):
         pass
@@ -109,44 +129,62 @@ class Controller(abc.ABC):
     def register_object(self, obj, id=None):
         pass
 
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Group the controller calls made inside the block. Controllers that have
+        bookkeeping to defer override this, by default the calls are applied right away.
+        """
+        yield
+
 
 class FallbackController:
     pass
 
 
-class BackendObject:
+class _BackendType(type):
+    def __call__(cls, *args, **kwargs):
+        obj = super().__call__(*args, **kwargs)
+        # Factory products are registered as soon as they are initialized, so that
+        # factories can use their product before returning it.
+        if _controller._factory_product is obj and hasattr(obj, "__register__"):
+            obj.__register__()
+        return obj
+
+
+class BackendObject(metaclass=_BackendType):
+    # Objects are dirty until their state has been saved by the controller.
+    _n3d_dirty = True
+
     def __init_subclass__(cls, requires=None, **kwargs):
         super().__init_subclass__(**kwargs)
         cls._support_requirements = requires
 
     def __new__(cls, *args, **kwargs):
-        backend = get_backend()
-        controller = backend.get_controller()
-        missing = [r for r in cls._support_requirements if not hasattr(controller, r)]
-        if missing:
-            raise MissingControllerSupport(f"Can't create {cls.__name__} because {backend.name} misses {', '.join(missing)} to support it.")
+        if cls not in _supported:
+            _check_support(cls)
         obj = super().__new__(cls)
+        controller = _controller
         if controller._factory_id is not None:
-            id = controller._factory_id
             if controller._factory_product is not None:
                 raise TooManyProductsError(f"Can't create {cls}, already created {controller._factory_product}.")
             controller._factory_product = obj
-            controller.register_object(obj, id)
-            if hasattr(obj, "__register__"):
-                # We are __new__ and call __init__ ourselves, so we replace it
-                # with a function that when called by the Python interpreter
-                # after __new__ restores __init__.
-                obj.__init__(*args, **kwargs)
-                restore_init = obj.__init__
-                def __init__(self, *args, **kwargs):
-                    self.__init__ = restore_init
-
-                obj.__init__ = __init__.__get__(obj)
-                obj.__register__()
+            # The product's `__register__` hook is called by `_BackendType.__call__`,
+            # once the product has been initialized.
+            controller.register_object(obj, controller._factory_id)
         return obj
 
+    def __setattr__(self, attr, value):
+        super().__setattr__(attr, value)
+        if attr not in _untracked_attrs:
+            super().__setattr__("_n3d_dirty", True)
+
     def __getstate__(self):
-        return {k: v for k, v in self.__dict__.items() if k != "_backend_obj"}
+        return {k: v for k, v in self.__dict__.items() if k not in _untracked_attrs}
+
+
+# Attributes that are not part of the saved state of a `BackendObject`
+_untracked_attrs = frozenset(("_backend_obj", "_n3d_dirty"))
 
 
 class RequiresSupport:
@@ -155,9 +193,13 @@ class RequiresSupport:
         cls._support_requirements = requires
 
     def __new__(cls, *args, **kwargs):
-        backend = get_backend()
-        controller = backend.get_controller()
-        missing = [r for r in cls._support_requirements if not hasattr(controller, r)]
-        if missing:
-            raise MissingControllerSupport(f"Can't create {cls.__name__} because {backend.name} misses {', '.join(missing)} to support it.")
+        if cls not in _supported:
+            _check_support(cls)
         return super().__new__(cls)
+
+
+def _check_support(cls):
+    missing = [r for r in cls._support_requirements if not hasattr(_controller, r)]
+    if missing:
+        raise MissingControllerSupport(f"Can't create {cls.__name__} because {_backend.name} misses {', '.join(missing)} to support it.")
+    _supported.add(cls)
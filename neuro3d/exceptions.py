@@ -10,6 +10,7 @@ _t(
             BackendUnavailableError=_e("backend"),
             MissingControllerSupport=_e(),
             UnknownBackendError=_e("name"),
+            RemoteControllerError=_e(),
         ),
         FactoryError=_e(
             TooManyProductsError=_e(),
@@ -22,5 +23,8 @@ _t(
         AnimationError=_e(
             CalibrationNotSupportedError=_e(),
         ),
+        RenderError=_e(
+            WorkerError=_e(),
+        ),
     )
 )
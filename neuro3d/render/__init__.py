@@ -0,0 +1,441 @@
+import abc, os, time, shutil, traceback, concurrent.futures
+from ..backend import get_backend
+from ..exceptions import *
+from .scheduler import FrameScheduler
+from .telemetry import Telemetry
+from .planning import plan_workers
+from .tiles import split_tiles, get_tile_paths, write_stitched
+
+class BackendRender(abc.ABC):
+    # Render threads, and cores to pin the render processes to, if set.
+    threads = None
+    cpu_set = None
+
+    def __init__(self, file):
+        self.file = file
+
+    def _pinned(self, command):
+        # Prefix a command to pin it to the cores of `cpu_set`.
+        if self.cpu_set is None or not shutil.which("taskset"):
+            return command
+        return ["taskset", "-c", ",".join(str(c) for c in self.cpu_set), *command]
+
+    @abc.abstractmethod
+    def render_portion(self, rank, size):
+        pass
+
+    @abc.abstractmethod
+    def render_frames(self, frames, log=None):
+        """
+        Render frames. If given, ``log`` is called with each line of output instead of
+        printing it.
+        """
+        pass
+
+    @abc.abstractmethod
+    def get_output(self, frame):
+        pass
+
+    @abc.abstractmethod
+    def get_frame_range(self):
+        pass
+
+    def create_log_parser(self):
+        """
+        Parser of the render output that collects the ``frames`` statistics, if the
+        output of this backend can be parsed.
+        """
+        return None
+
+    def get_fingerprints(self, frames):
+        """
+        Fingerprint of the scene content of each frame, frames with equal fingerprints
+        render to the same image. Used by the render cache.
+
+        :returns: A dictionary of fingerprint strings per frame.
+        """
+        raise NotImplementedError(f"{type(self).__name__} can't fingerprint frames.")
+
+    def render_tile(self, frame, border, path):
+        """
+        Render the ``(min x, max x, min y, max y)`` border region of a frame, with y from
+        the bottom, and save it to an ``.npz`` file with the 8 bit RGBA ``pixels`` of
+        the region (top row first), its ``offset`` from the top left corner and the
+        ``size`` of the full image.
+        """
+        raise NotImplementedError(f"{type(self).__name__} can't render tiles.")
+
+    def worker_command(self, host, port, authkey):
+        """
+        Command that starts a persistent render worker process, see
+        :class:`~.render.workers.PersistentWorker`.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no persistent workers.")
+
+class Renderer:
+    def __init__(
+        self,
+        file,
+        workers=None,
+        frames=None,
+        chunk_size=1,
+        retries=2,
+        resume=True,
+        persistent=False,
+        backend_render=None,
+        report=None,
+        progress_interval=5.0,
+        video=None,
+        fps=24,
+        cache=None,
+        deduplicate=False,
+        threads=None,
+        pin=False,
+        memory_per_worker=None,
+    ):
+        self.file = file
+        self.threads = threads
+        self.plan = plan_workers(workers, threads, pin, memory_per_worker)
+        self.frames = frames
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.resume = resume
+        self.persistent = persistent
+        self.report = report
+        self.progress_interval = progress_interval
+        self.telemetry = None
+        self.video = video
+        self.fps = fps
+        self._assembler = None
+        self.cache = cache
+        self._cache = None
+        self._fingerprints = None
+        self.deduplicate = deduplicate
+        # Frames with the same content as a rendered frame, per rendered frame.
+        self._duplicates = {}
+        if backend_render is None:
+            backend_render = get_backend().get_renderer()
+        self._bc = backend_render
+
+    @property
+    def workers(self):
+        return self.plan.workers
+
+    def _create_render(self, worker_id):
+        bc = self._bc(self.file)
+        bc.threads = self.plan.threads
+        if self.plan.cpu_sets is not None:
+            bc.cpu_set = self.plan.cpu_sets[worker_id]
+        return bc
+
+    def get_frames(self):
+        if self.frames is not None:
+            return list(self.frames)
+        start, stop = self._bc(self.file).get_frame_range()
+        return list(range(start, stop + 1))
+
+    def create_scheduler(self):
+        all_frames = frames = self.get_frames()
+        bc = self._bc(self.file)
+        if self.cache is not None or self.deduplicate:
+            self._fingerprints = bc.get_fingerprints(all_frames)
+        if self.cache is not None:
+            frames = self._restore_cached(bc, frames)
+        elif self.resume:
+            # Skip frames that were rendered by a previous, interrupted, job.
+            frames = [f for f in frames if not os.path.exists(bc.get_output(f))]
+        if self.deduplicate:
+            frames = self._find_duplicates(bc, frames)
+        for f in frames:
+            # Outputs are hard linked to duplicate frames and the cache, unlink them so
+            # that they aren't overwritten in place.
+            output = bc.get_output(f)
+            if os.path.exists(output) and os.stat(output).st_nlink > 1:
+                os.remove(output)
+        scheduler = FrameScheduler(frames, self.chunk_size, self.retries)
+        self.telemetry = Telemetry(scheduler.total, self.progress_interval)
+        if self.video is not None:
+            from .video import VideoAssembler, create_encoder
+
+            self._assembler = VideoAssembler(create_encoder(self.video, self.fps), all_frames)
+            queued = set(frames)
+            for f in all_frames:
+                if f not in queued:
+                    self._assembler.add(f, bc.get_output(f))
+        return scheduler
+
+    def _restore_cached(self, bc, frames):
+        # Reuse the cached outputs of frames whose content did not change, and return
+        # the frames that have to be rendered. Frames of interrupted jobs were cached
+        # as they completed, so this also resumes them.
+        from .cache import RenderCache
+
+        self._cache = RenderCache(self.cache)
+        fingerprints = self._fingerprints
+        queued = []
+        for f in frames:
+            output = bc.get_output(f)
+            if not self._cache.restore(fingerprints[f], output):
+                # Remove outdated output, so that it isn't mistaken for a rendered frame.
+                if os.path.exists(output):
+                    os.remove(output)
+                queued.append(f)
+        print(f"Reused {len(frames) - len(queued)} cached frames", flush=True)
+        return queued
+
+    def _find_duplicates(self, bc, frames):
+        # Queue only the first of the frames that have the same content, the others
+        # get a copy of its output.
+        fingerprints = self._fingerprints
+        first = {}
+        queued = []
+        self._duplicates = {}
+        for f in frames:
+            original = first.setdefault(fingerprints[f], f)
+            if original == f:
+                queued.append(f)
+            else:
+                self._duplicates.setdefault(original, []).append(f)
+        print(f"Rendering {len(queued)} unique frames of {len(frames)}", flush=True)
+        return queued
+
+    def _complete(self, scheduler, chunk, missing, records):
+        from .cache import link_file
+
+        given_up = scheduler.complete(chunk, missing)
+        self.telemetry.record_many(records)
+        bc = self._bc(self.file)
+        done = []
+        for f in chunk:
+            if f in missing:
+                continue
+            done.append(f)
+            for duplicate in self._duplicates.get(f, ()):
+                link_file(bc.get_output(f), bc.get_output(duplicate))
+                done.append(duplicate)
+        if self._cache is not None:
+            for f in chunk:
+                if f not in missing:
+                    self._cache.store(self._fingerprints[f], bc.get_output(f))
+        if self._assembler is not None:
+            # Stream the finished frames into the video, the assembler puts them in
+            # order.
+            for f in done:
+                self._assembler.add(f, bc.get_output(f))
+            for f in given_up:
+                self._assembler.skip(f)
+                for duplicate in self._duplicates.get(f, ()):
+                    self._assembler.skip(duplicate)
+
+    def _finish(self, scheduler):
+        if scheduler.failed:
+            print("Frames failed to render:", sorted(scheduler.failed), flush=True)
+        if self._assembler is not None:
+            self._assembler.close()
+            print(f"Wrote {self._assembler.written} frames to '{self._assembler.encoder.path}'", flush=True)
+            self._assembler = None
+        self._cache = None
+        self._fingerprints = None
+        if self.report is not None:
+            self.telemetry.write(self.report)
+
+    def render_queue(self):
+        scheduler = self.create_scheduler()
+        print(f"Starting render queue of {scheduler.total} frames on {self.plan}")
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as pool:
+            futures = [pool.submit(self._work, scheduler, i) for i in range(self.workers)]
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        self._finish(scheduler)
+        return scheduler
+
+    def _work(self, scheduler, worker_id):
+        bc = self._create_render(worker_id)
+        worker = None
+        try:
+            while True:
+                chunk = scheduler.get()
+                if chunk is None:
+                    break
+                worker, missing, records = self._render_chunk(bc, worker, chunk, worker_id)
+                self._complete(scheduler, chunk, missing, records)
+        finally:
+            if worker is not None:
+                worker.close()
+
+    def _render_chunk(self, bc, worker, chunk, worker_id):
+        # Render a chunk of frames, returns the persistent worker to use for the next
+        # chunk, the frames of the chunk that did not produce output and a telemetry
+        # record per frame.
+        from .workers import PersistentWorker
+
+        stats = {}
+        start = time.perf_counter()
+        try:
+            if self.persistent:
+                # Persistent workers load the scene once, instead of once per chunk.
+                # Dead workers are replaced on the next chunk.
+                if worker is None:
+                    worker = PersistentWorker(bc)
+                results = worker.render((f, bc.get_output(f)) for f in chunk)
+                for frame, _, seconds, peak in results:
+                    stats[frame] = {"wall": seconds, "peak_memory": peak}
+            else:
+                parser = bc.create_log_parser()
+                bc.render_frames(chunk, log=parser and parser.feed)
+                if parser is not None:
+                    stats = parser.frames
+        except WorkerError:
+            traceback.print_exc()
+            if worker is not None:
+                worker.close()
+                worker = None
+        except Exception:
+            traceback.print_exc()
+        # Without per frame timings, spread the time of the chunk over its frames.
+        wall = (time.perf_counter() - start) / len(chunk)
+        missing = [f for f in chunk if not os.path.exists(bc.get_output(f))]
+        records = [
+            dict(
+                {"wall": wall},
+                **stats.get(f, {}),
+                frame=f,
+                worker=worker_id,
+                ok=f not in missing,
+            )
+            for f in chunk
+        ]
+        return worker, missing, records
+
+    def render_portions(self):
+        print("Starting rendering job pool")
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as pool:
+            futures = [
+                pool.submit(self._create_render(i).render_portion, i, self.workers)
+                for i in range(self.workers)
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                print("Render worker completed", future.result())
+
+    def render_mpi(self, comm):
+        from .mpi import render_master, render_worker
+
+        rank = comm.Get_rank()
+        size = comm.Get_size()
+        if size == 1:
+            return self.render_queue()
+        if rank == 0:
+            scheduler = self.create_scheduler()
+            print(f"Dispatching {scheduler.total} frames to {size - 1} workers", flush=True)
+            render_master(comm, scheduler, self._complete)
+            self._finish(scheduler)
+        else:
+            scheduler = None
+            render_worker(comm, self)
+        comm.Barrier()
+        return scheduler
+
+    def render_still(self, frame, output, tiles=(4, 4)):
+        """
+        Render a single frame to a PNG image, split into ``rows, cols`` tiles that are
+        rendered in parallel by the workers.
+        """
+        borders = split_tiles(*tiles)
+        paths = get_tile_paths(output, len(borders))
+        os.makedirs(os.path.dirname(paths[0]), exist_ok=True)
+        print(f"Rendering {len(borders)} tiles of frame {frame} on {self.plan}", flush=True)
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as pool:
+            futures = [
+                pool.submit(self._render_tiles, i, frame, borders, paths)
+                for i in range(self.workers)
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        write_stitched(paths, output)
+
+    def _render_tiles(self, worker_id, frame, borders, paths, step=None):
+        # Render every `step`-th tile, starting from the worker's own tile.
+        bc = self._create_render(worker_id)
+        step = step or self.workers
+        for border, path in zip(borders[worker_id::step], paths[worker_id::step]):
+            _render_tile(bc, frame, border, path)
+
+    def render_mpi_still(self, comm, frame, output, tiles=(4, 4)):
+        """
+        Render a single frame to a PNG image, with its tiles divided over the MPI
+        ranks. Rank 0 stitches the tiles.
+        """
+        rank = comm.Get_rank()
+        size = comm.Get_size()
+        borders = split_tiles(*tiles)
+        paths = get_tile_paths(output, len(borders))
+        if rank == 0:
+            os.makedirs(os.path.dirname(paths[0]), exist_ok=True)
+            print(f"Rendering {len(borders)} tiles of frame {frame} on {size} ranks", flush=True)
+        comm.Barrier()
+        bc = self._bc(self.file)
+        bc.threads = self.threads
+        error = None
+        try:
+            for border, path in zip(borders[rank::size], paths[rank::size]):
+                _render_tile(bc, frame, border, path)
+        except Exception as e:
+            error = repr(e)
+        _check_ranks(comm, error, f"Tiles of frame {frame} failed to render")
+        # Every rank waits for the stitching result, so that they all raise if it fails.
+        error = None
+        if rank == 0:
+            try:
+                write_stitched(paths, output)
+            except Exception as e:
+                error = repr(e)
+        _check_ranks(comm, error, f"Tiles of frame {frame} could not be stitched")
+
+    def render_mpi_portions(self, comm):
+        rank = comm.Get_rank()
+        size = comm.Get_size()
+        print(f"Rendering on worker {rank} of {size}", flush=True)
+        res = self._bc(self.file).render_portion(rank, size)
+        print(f"Render worker {rank} completed", res, flush=True)
+        comm.Barrier()
+
+def render(file, workers=None, comm=None, calibrate=False, **kwargs):
+    """
+    Render the frames of a file. See :class:`Renderer` for the options.
+
+    :param calibrate: Try a few plans of workers and threads on a sample of frames
+      first, and render with the fastest one. Not available with MPI.
+    """
+    renderer = Renderer(file, workers, **kwargs)
+    if calibrate and not comm:
+        from .planning import calibrate as _calibrate
+
+        renderer.plan, _ = _calibrate(renderer)
+    if comm:
+        renderer.render_mpi(comm)
+    else:
+        renderer.render_queue()
+
+
+def _render_tile(bc, frame, border, path):
+    if bc.render_tile(frame, border, path) or not os.path.exists(path):
+        raise RenderError(f"Tile {border} of frame {frame} was not rendered.")
+
+
+def _check_ranks(comm, error, message):
+    # Collective error check: if any rank failed, all ranks raise.
+    errors = [e for e in comm.allgather(error) if e is not None]
+    if errors:
+        raise RenderError(f"{message}: {errors}")
+
+
+def render_still(file, frame, output, tiles=(4, 4), workers=None, comm=None, **kwargs):
+    """
+    Render a single frame to a PNG image in tiles, for stills that are too large to
+    render on a single worker. See :meth:`Renderer.render_still`.
+    """
+    renderer = Renderer(file, workers, **kwargs)
+    if comm:
+        renderer.render_mpi_still(comm, frame, output, tiles)
+    else:
+        renderer.render_still(frame, output, tiles)
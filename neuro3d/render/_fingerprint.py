@@ -0,0 +1,158 @@
+# Frame fingerprint script. This file is executed as a script inside Blender and can't
+# import `neuro3d`.
+#
+# Usage: blender -b file --python _fingerprint.py -- <output json> <frame>[,<frame>...]
+import sys, json, hashlib
+import numpy as np
+
+# Properties that change without affecting the rendered image.
+_IGNORED = frozenset(
+    ("rna_type", "name_full", "session_uid", "users", "is_evaluated", "original", "tag")
+)
+# Enum values of the keyframe interpolations that are evaluated with NumPy.
+_CONSTANT, _LINEAR = 0, 1
+
+
+def _hash_props(h, struct):
+    # Hash the value of all plain properties of a Blender data structure.
+    for prop in struct.bl_rna.properties:
+        key = prop.identifier
+        if key in _IGNORED or prop.type in ("POINTER", "COLLECTION"):
+            continue
+        try:
+            value = getattr(struct, key)
+        except AttributeError:
+            continue
+        if isinstance(value, set):
+            value = sorted(value)
+        elif prop.type != "STRING" and not isinstance(value, (bool, int, float, str)):
+            value = tuple(value)
+        h.update(f"{key}={value!r};".encode())
+
+
+def _hash_coords(h, collection, attr="co", width=3):
+    values = np.empty(len(collection) * width, dtype=np.float32)
+    collection.foreach_get(attr, values)
+    h.update(values.tobytes())
+
+
+def static_hash(scene):
+    """
+    Hash of everything that the keyframes don't change: the render settings and the
+    objects, their data and materials as they are on the first frame.
+    """
+    import bpy
+
+    scene.frame_set(scene.frame_start)
+    h = hashlib.sha256()
+    _hash_props(h, scene.render)
+    _hash_props(h, scene.render.image_settings)
+    h.update(repr(scene.camera and scene.camera.name).encode())
+    if scene.world is not None:
+        _hash_props(h, scene.world)
+    for obj in sorted(scene.objects, key=lambda o: o.name):
+        h.update(obj.name.encode())
+        _hash_props(h, obj)
+        h.update(np.array(obj.matrix_world, dtype=np.float32).tobytes())
+        data = obj.data
+        if data is None:
+            continue
+        _hash_props(h, data)
+        if isinstance(data, bpy.types.Mesh):
+            _hash_coords(h, data.vertices)
+            indices = np.empty(len(data.loops), dtype=np.int32)
+            data.loops.foreach_get("vertex_index", indices)
+            h.update(indices.tobytes())
+        elif isinstance(data, bpy.types.Curve):
+            for spline in data.splines:
+                _hash_props(h, spline)
+                _hash_coords(h, spline.points, width=4)
+                _hash_coords(h, spline.bezier_points)
+        for material in getattr(data, "materials", ()):
+            if material is None:
+                continue
+            _hash_props(h, material)
+            if material.node_tree is not None:
+                for node in material.node_tree.nodes:
+                    for socket in node.inputs:
+                        if hasattr(socket, "default_value"):
+                            _hash_props(h, socket)
+    return h.hexdigest()
+
+
+def _animated_ids():
+    import bpy
+
+    for collection in (
+        bpy.data.objects,
+        bpy.data.meshes,
+        bpy.data.curves,
+        bpy.data.materials,
+        bpy.data.cameras,
+        bpy.data.lights,
+        bpy.data.worlds,
+        bpy.data.scenes,
+    ):
+        for id in collection:
+            yield id
+            node_tree = getattr(id, "node_tree", None)
+            if node_tree is not None:
+                yield node_tree
+
+
+def animated_values(frames):
+    """
+    Values of all keyframed properties on the given frames, as an array with a row
+    per frame.
+    """
+    frames = np.asarray(frames, dtype=float)
+    columns = []
+    for id in sorted(_animated_ids(), key=lambda id: (type(id).__name__, id.name)):
+        anim = id.animation_data
+        if anim is None or anim.action is None:
+            continue
+        for fcurve in anim.action.fcurves:
+            kps = fcurve.keyframe_points
+            n = len(kps)
+            if not n or fcurve.mute:
+                continue
+            co = np.empty(n * 2, dtype=np.float32)
+            kps.foreach_get("co", co)
+            kx, ky = co[::2], co[1::2]
+            interpolation = np.empty(n, dtype=np.int32)
+            kps.foreach_get("interpolation", interpolation)
+            if np.all(interpolation == _LINEAR):
+                columns.append(np.interp(frames, kx, ky))
+            elif np.all(interpolation == _CONSTANT):
+                i = np.clip(np.searchsorted(kx, frames, side="right") - 1, 0, n - 1)
+                columns.append(ky[i])
+            else:
+                columns.append(np.array([fcurve.evaluate(f) for f in frames]))
+    if not columns:
+        return np.empty((len(frames), 0))
+    return np.column_stack(columns)
+
+
+def fingerprints(scene, frames):
+    """
+    Fingerprint of each frame: the static hash and the animated values on the frame.
+    """
+    static = static_hash(scene).encode()
+    values = animated_values(frames)
+    if scene.render.use_stamp:
+        # Burnt in metadata can show the frame number or time.
+        values = np.column_stack((values, frames))
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    return {
+        frame: hashlib.sha256(static + row.tobytes()).hexdigest()
+        for frame, row in zip(frames, values)
+    }
+
+
+if __name__ == "__main__":
+    import bpy
+
+    argv = sys.argv[sys.argv.index("--") + 1 :]
+    output, frames = argv[0], [int(f) for f in argv[1].split(",")]
+    with open(output, "w") as f:
+        json.dump(fingerprints(bpy.context.scene, frames), f)
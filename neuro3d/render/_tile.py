@@ -0,0 +1,49 @@
+# Tile render script. This file is executed as a script inside Blender and can't import
+# `neuro3d`.
+#
+# Usage: blender -b file --python _tile.py -- <frame> <min x> <max x> <min y> <max y> <output npz>
+import os, sys
+import numpy as np
+
+
+def render_tile(scene, frame, border, output):
+    """
+    Render the border region of a frame, given as fractions of the image with y from
+    the bottom, and save its 8 bit RGBA pixels, top row first, together with its
+    offset from the top left corner and the size of the full image.
+    """
+    import bpy
+
+    min_x, max_x, min_y, max_y = border
+    render = scene.render
+    scene.frame_set(frame)
+    render.use_border = True
+    render.use_crop_to_border = True
+    render.border_min_x, render.border_max_x = min_x, max_x
+    render.border_min_y, render.border_max_y = min_y, max_y
+    render.image_settings.file_format = "PNG"
+    render.image_settings.color_mode = "RGBA"
+    render.image_settings.color_depth = "8"
+    png = output + ".png"
+    render.filepath = png
+    bpy.ops.render.render(write_still=True)
+    image = bpy.data.images.load(png)
+    w, h = image.size
+    pixels = np.empty(w * h * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    bpy.data.images.remove(image)
+    os.remove(png)
+    # Blender stores the rows bottom to top.
+    pixels = np.rint(pixels.reshape(h, w, 4)[::-1] * 255).astype(np.uint8)
+    width = int(render.resolution_x * render.resolution_percentage / 100)
+    height = int(render.resolution_y * render.resolution_percentage / 100)
+    offset = (int(min_x * width), max(0, height - int(min_y * height) - h))
+    np.savez(output, pixels=pixels, offset=offset, size=(width, height))
+
+
+if __name__ == "__main__":
+    import bpy
+
+    argv = sys.argv[sys.argv.index("--") + 1 :]
+    frame, border, output = int(argv[0]), [float(v) for v in argv[1:5]], argv[5]
+    render_tile(bpy.context.scene, frame, border, output)
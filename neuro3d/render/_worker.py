@@ -0,0 +1,89 @@
+# Render worker process. This file is executed as a script inside Blender, or inside a
+# plain Python interpreter for the stub worker, and can't import `neuro3d`.
+#
+# Usage: <python|blender -b file --python> _worker.py -- <mode> <host> <port> <authkey> [delay]
+import sys, time, traceback
+from multiprocessing.connection import Client
+
+
+def serve(address, authkey, render_frame):
+    """
+    Connect to the renderer and render the ``(frame, path)`` assignments it sends,
+    until it sends ``stop``. Every assignment is answered with a list of ``(frame,
+    success, seconds, peak memory)`` results.
+    """
+    with Client(address, authkey=authkey) as conn:
+        while True:
+            msg = conn.recv()
+            if msg[0] == "stop":
+                break
+            results = []
+            for frame, path in msg[1]:
+                start = time.perf_counter()
+                try:
+                    render_frame(frame, path)
+                except Exception:
+                    traceback.print_exc()
+                    ok = False
+                else:
+                    ok = True
+                results.append((frame, ok, time.perf_counter() - start, _peak_memory()))
+            conn.send(results)
+
+
+def _peak_memory():
+    # Peak memory of the worker process so far, in MB.
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, and in kilobytes elsewhere.
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def blender_frame_renderer():
+    import bpy
+
+    scene = bpy.context.scene
+
+    def render_frame(frame, path):
+        scene.frame_set(frame)
+        scene.render.filepath = path
+        bpy.ops.render.render(write_still=True)
+
+    return render_frame
+
+
+def stub_frame_renderer(delay=0.0):
+    import os
+
+    def render_frame(frame, path):
+        import struct, zlib
+
+        time.sleep(delay)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A 16x16 grayscale PNG, with a shade that depends on the frame.
+        raw = (b"\x00" + bytes([frame % 256]) * 16) * 16
+
+        def chunk(tag, data):
+            body = tag + data
+            return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", 16, 16, 8, 0, 0, 0, 0)))
+            f.write(chunk(b"IDAT", zlib.compress(raw)))
+            f.write(chunk(b"IEND", b""))
+
+    return render_frame
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else sys.argv[1:]
+    mode, host, port, authkey = argv[:4]
+    if mode == "blender":
+        render_frame = blender_frame_renderer()
+    else:
+        render_frame = stub_frame_renderer(*map(float, argv[4:5]))
+    serve((host, int(port)), bytes.fromhex(authkey), render_frame)
@@ -0,0 +1,53 @@
+import os, shutil, threading
+
+# Path of the script that fingerprints the frames of a scene inside Blender.
+FINGERPRINT_SCRIPT = os.path.join(os.path.dirname(__file__), "_fingerprint.py")
+
+
+class RenderCache:
+    """
+    Directory of rendered frames, named after the fingerprint of the scene content
+    they show, that can be reused across render jobs. Files are hard linked in and
+    out of the cache when possible, and copied otherwise.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get_path(self, fingerprint, ext):
+        return os.path.join(self.directory, fingerprint + ext)
+
+    def restore(self, fingerprint, output):
+        """
+        Put the cached frame with the given fingerprint at ``output``.
+
+        :returns: Whether the frame was cached.
+        """
+        cached = self.get_path(fingerprint, os.path.splitext(output)[1])
+        if not os.path.exists(cached):
+            return False
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        link_file(cached, output)
+        return True
+
+    def store(self, fingerprint, output):
+        """
+        Add a rendered frame to the cache.
+        """
+        link_file(output, self.get_path(fingerprint, os.path.splitext(output)[1]))
+
+
+def link_file(source, target):
+    """
+    Hard link, or copy, ``source`` to ``target``. The target is replaced at once, and
+    a target that shares its inode with another file is unlinked, not overwritten.
+    """
+    if os.path.exists(target) and os.path.samefile(source, target):
+        return
+    tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
@@ -0,0 +1,81 @@
+# Message tags
+_READY = 1
+_DONE = 2
+_WORK = 3
+
+
+def render_master(comm, scheduler, complete, max_rank_failures=3):
+    """
+    Dispatch chunks of frames from the scheduler to the worker ranks on demand, and
+    pass the scheduler and their ``chunk, missing, records`` results to ``complete``.
+    Chunks of failed ranks are put back in the queue for the other ranks, ranks that
+    fail too often are retired.
+    """
+    from mpi4py import MPI
+
+    status = MPI.Status()
+    workers = comm.Get_size() - 1
+    idle = []
+    rank_failures = {}
+
+    def dispatch():
+        nonlocal workers
+        while idle:
+            chunk = scheduler.get(block=False)
+            if chunk is None:
+                break
+            comm.send(chunk, dest=idle.pop(), tag=_WORK)
+        if scheduler.done:
+            # Everything has been rendered, release the idle ranks.
+            while idle:
+                comm.send(None, dest=idle.pop(), tag=_WORK)
+                workers -= 1
+
+    while workers:
+        msg = comm.recv(source=MPI.ANY_SOURCE, tag=MPI.ANY_TAG, status=status)
+        rank = status.Get_source()
+        if status.Get_tag() == _DONE:
+            chunk, missing, records, error = msg
+            complete(scheduler, chunk, missing, records)
+            if error is not None:
+                print(f"Render rank {rank} failed on {chunk}: {error}", flush=True)
+                rank_failures[rank] = rank_failures.get(rank, 0) + 1
+        if rank_failures.get(rank, 0) >= max_rank_failures:
+            print(f"Retiring render rank {rank} after repeated failures.", flush=True)
+            comm.send(None, dest=rank, tag=_WORK)
+            workers -= 1
+        else:
+            idle.append(rank)
+        dispatch()
+    # Frames that are left when all ranks have been retired
+    scheduler.cancel()
+
+
+def render_worker(comm, renderer):
+    """
+    Request chunks of frames from rank 0 and render them until it sends ``None``.
+    """
+    bc = renderer._bc(renderer.file)
+    # Ranks are placed and bound by the MPI launcher, only limit their threads.
+    bc.threads = renderer.threads
+    rank = comm.Get_rank()
+    worker = None
+    comm.send(None, dest=0, tag=_READY)
+    try:
+        while True:
+            chunk = comm.recv(source=0, tag=_WORK)
+            if chunk is None:
+                break
+            error = None
+            try:
+                worker, missing, records = renderer._render_chunk(bc, worker, chunk, rank)
+            except Exception as e:
+                error = repr(e)
+                missing = chunk
+                records = [dict(frame=f, worker=rank, ok=False) for f in chunk]
+            if missing and error is None:
+                error = f"no output for frames {missing}"
+            comm.send((chunk, missing, records, error), dest=0, tag=_DONE)
+    finally:
+        if worker is not None:
+            worker.close()
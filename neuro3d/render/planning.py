@@ -0,0 +1,126 @@
+import os, time
+
+# Render threads per worker above which Blender barely speeds up on most scenes.
+DEFAULT_THREADS = 4
+
+
+class RenderPlan:
+    """
+    Number of render workers, render threads per worker and, when pinned, the disjoint
+    set of cores of each worker.
+    """
+
+    def __init__(self, workers, threads, cpu_sets=None):
+        self.workers = workers
+        self.threads = threads
+        self.cpu_sets = cpu_sets
+
+    def __repr__(self):
+        pinned = ", pinned" if self.cpu_sets else ""
+        return f"<RenderPlan {self.workers} workers x {self.threads} threads{pinned}>"
+
+
+def available_cores():
+    """
+    The cores this process is allowed to run on.
+    """
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+def available_memory():
+    """
+    Available memory in MB, or ``None`` if it can't be determined.
+    """
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def plan_workers(workers=None, threads=None, pin=False, memory_per_worker=None, cores=None):
+    """
+    Plan the workers and threads per worker so that together they use every core once.
+    Whatever is not given is derived from the available cores, and the number of
+    workers is limited to the available memory divided by ``memory_per_worker`` MB.
+
+    :param pin: Give each worker its own set of cores.
+    :param cores: The cores to plan for, defaults to :func:`available_cores`.
+    """
+    cores = available_cores() if cores is None else list(cores)
+    n = len(cores)
+    if workers is None:
+        threads = threads or min(DEFAULT_THREADS, n)
+        workers = max(1, n // threads)
+        if memory_per_worker:
+            memory = available_memory()
+            if memory is not None:
+                workers = max(1, min(workers, int(memory // memory_per_worker)))
+    elif threads is None:
+        threads = max(1, n // workers)
+    cpu_sets = None
+    if pin:
+        # Workers share cores round robin if there are more threads than cores.
+        cpu_sets = [
+            [cores[(w * threads + t) % n] for t in range(threads)] for w in range(workers)
+        ]
+    return RenderPlan(workers, threads, cpu_sets)
+
+
+def candidate_plans(cores=None, **kwargs):
+    """
+    Plans that use all cores, from a single worker using all of them to a worker per
+    core, by powers of 2. Other arguments are passed to :func:`plan_workers`.
+    """
+    cores = available_cores() if cores is None else list(cores)
+    threads = len(cores)
+    plans = []
+    while threads >= 1:
+        plans.append(plan_workers(threads=threads, cores=cores, **kwargs))
+        threads //= 2
+    return plans
+
+
+def calibrate(renderer, plans=None, frames_per_worker=2):
+    """
+    Render a sample of frames with each plan and return the plan with the highest
+    throughput. The sampled frames are rendered from the start of the frame range and
+    overwrite existing outputs.
+
+    :param renderer: The renderer to calibrate, its settings are restored afterwards.
+    :type renderer: ~.render.Renderer
+    :param plans: The plans to try, defaults to :func:`candidate_plans`.
+    :returns: The best plan and the frames per second of each plan.
+    """
+    if plans is None:
+        plans = candidate_plans(pin=renderer.plan.cpu_sets is not None)
+    frames = renderer.get_frames()
+    # Render every sampled frame, and nothing else.
+    overrides = dict(resume=False, report=None, video=None, cache=None, deduplicate=False)
+    saved = {k: getattr(renderer, k) for k in ("plan", "frames", *overrides)}
+    results = []
+    try:
+        for k, v in overrides.items():
+            setattr(renderer, k, v)
+        for plan in plans:
+            renderer.plan = plan
+            renderer.frames = frames[: plan.workers * frames_per_worker]
+            start = time.perf_counter()
+            scheduler = renderer.render_queue()
+            rate = len(scheduler.completed) / (time.perf_counter() - start)
+            print(f"Calibrated {plan}: {rate:.2f} frames/s", flush=True)
+            results.append((plan, rate))
+    finally:
+        for k, v in saved.items():
+            setattr(renderer, k, v)
+    best = max(results, key=lambda r: r[1])[0]
+    return best, results
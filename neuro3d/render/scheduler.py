@@ -0,0 +1,75 @@
+import collections, threading
+
+
+class FrameScheduler:
+    """
+    Thread-safe queue that hands out chunks of frames to workers on demand. Frames
+    that fail are put back in the queue as single frame chunks until they run out of
+    retries.
+    """
+
+    def __init__(self, frames, chunk_size=1, retries=2):
+        frames = list(frames)
+        self._queue = collections.deque(
+            frames[i : i + chunk_size] for i in range(0, len(frames), chunk_size)
+        )
+        self._retries = retries
+        self._attempts = collections.Counter()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self.total = len(frames)
+        self.completed = []
+        self.failed = []
+
+    def get(self, block=True):
+        """
+        Get the next chunk of frames. Blocks while the queue is empty but chunks that
+        might be retried are still in flight.
+
+        :param block: If ``False``, return ``None`` instead of waiting.
+        :returns: A list of frames, or ``None`` when all work is done.
+        """
+        with self._cond:
+            while block and not self._queue and self._in_flight:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            self._in_flight += 1
+            return self._queue.popleft()
+
+    def complete(self, chunk, failed=()):
+        """
+        Report a chunk as done, with the frames of it that ``failed``.
+
+        :returns: The failed frames that ran out of retries.
+        """
+        failed = set(failed)
+        given_up = []
+        with self._cond:
+            for frame in chunk:
+                if frame not in failed:
+                    self.completed.append(frame)
+                    continue
+                self._attempts[frame] += 1
+                if self._attempts[frame] > self._retries:
+                    self.failed.append(frame)
+                    given_up.append(frame)
+                else:
+                    self._queue.append([frame])
+            self._in_flight -= 1
+            self._cond.notify_all()
+        return given_up
+
+    def cancel(self):
+        """
+        Mark all frames that are still queued as failed.
+        """
+        with self._cond:
+            while self._queue:
+                self.failed.extend(self._queue.popleft())
+            self._cond.notify_all()
+
+    @property
+    def done(self):
+        with self._cond:
+            return not self._queue and not self._in_flight
@@ -0,0 +1,110 @@
+import re, csv, json, time, threading
+
+_FRAME_LINE = re.compile(r"Fra:(\d+) Mem:([\d.]+)M \(Peak ([\d.]+)M\)")
+_TIME_LINE = re.compile(r"^\s*Time: ([\d:.]+)")
+
+# Columns of a frame record
+FIELDS = ("frame", "worker", "ok", "wall", "render_time", "peak_memory", "finished")
+
+
+def _parse_duration(s):
+    seconds = 0.0
+    for part in s.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+class BlenderLogParser:
+    """
+    Collects the render time and peak memory (in MB) of each frame from the output of
+    Blender.
+    """
+
+    def __init__(self):
+        self.frames = {}
+        self._frame = None
+
+    def feed(self, line):
+        match = _FRAME_LINE.search(line)
+        if match:
+            self._frame = frame = int(match.group(1))
+            stats = self.frames.setdefault(frame, {})
+            peak = float(match.group(3))
+            stats["peak_memory"] = max(stats.get("peak_memory", 0.0), peak)
+            return
+        match = _TIME_LINE.match(line)
+        if match and self._frame is not None:
+            # Blender reports the time of a frame after it is saved.
+            self.frames[self._frame]["render_time"] = _parse_duration(match.group(1))
+            self._frame = None
+
+
+class Telemetry:
+    """
+    Thread-safe collection of per frame render records, that prints a live progress
+    summary and writes JSON or CSV reports.
+    """
+
+    def __init__(self, total, interval=5.0):
+        self.total = total
+        self.interval = interval
+        self.records = []
+        # Running count of the successful records, for the progress of long renders.
+        self.rendered = 0
+        self._lock = threading.Lock()
+        self._start = time.time()
+        self._last_print = 0
+
+    def record_many(self, records):
+        with self._lock:
+            for record in records:
+                record.setdefault("finished", time.time())
+                self.records.append({k: record.get(k) for k in FIELDS})
+                if record.get("ok"):
+                    self.rendered += 1
+            now = time.time()
+            if now - self._last_print >= self.interval or self.rendered >= self.total:
+                self._last_print = now
+                print(self.progress(), flush=True)
+
+    def progress(self):
+        elapsed = time.time() - self._start
+        done = self.rendered
+        rate = done / elapsed if elapsed > 0 else 0.0
+        if rate > 0:
+            eta = time.strftime("%H:%M:%S", time.gmtime((self.total - done) / rate))
+        else:
+            eta = "--:--:--"
+        return f"Rendered {done}/{self.total} frames, {rate:.2f} frames/s, ETA {eta}"
+
+    def summary(self):
+        workers = {}
+        for r in self.records:
+            w = workers.setdefault(str(r["worker"]), {"frames": 0, "failed": 0, "wall": 0.0})
+            w["frames" if r["ok"] else "failed"] += 1
+            w["wall"] += r["wall"] or 0.0
+        slowest = sorted(
+            (r for r in self.records if r["ok"]), key=lambda r: r["wall"] or 0, reverse=True
+        )
+        return {
+            "total": self.total,
+            "rendered": self.rendered,
+            "elapsed": time.time() - self._start,
+            "workers": workers,
+            "slowest": [r["frame"] for r in slowest[:10]],
+        }
+
+    def write(self, path):
+        """
+        Write the frame records to a ``.csv`` file, or a ``.json`` file that also
+        contains a summary per worker.
+        """
+        with self._lock:
+            if path.endswith(".csv"):
+                with open(path, "w", newline="") as f:
+                    writer = csv.DictWriter(f, fieldnames=FIELDS)
+                    writer.writeheader()
+                    writer.writerows(self.records)
+            else:
+                with open(path, "w") as f:
+                    json.dump({"summary": self.summary(), "frames": self.records}, f, indent=2)
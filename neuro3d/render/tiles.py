@@ -0,0 +1,59 @@
+import os
+import numpy as np
+
+# Path of the script that renders a tile inside Blender.
+TILE_SCRIPT = os.path.join(os.path.dirname(__file__), "_tile.py")
+
+
+def split_tiles(rows, cols):
+    """
+    Split an image into a grid of border regions, as ``(min x, max x, min y, max y)``
+    fractions of the image with y from the bottom, like Blender's render border.
+    """
+    xs = np.linspace(0, 1, cols + 1)
+    ys = np.linspace(0, 1, rows + 1)
+    return [
+        (xs[c], xs[c + 1], ys[r], ys[r + 1]) for r in range(rows) for c in range(cols)
+    ]
+
+
+def get_tile_paths(output, n):
+    """
+    Paths of the ``n`` tiles of an output image.
+    """
+    return [os.path.join(f"{output}.tiles", f"tile_{i:04d}.npz") for i in range(n)]
+
+
+def stitch_tiles(paths):
+    """
+    Stitch the tiles saved by :meth:`~.render.BackendRender.render_tile` into the full
+    image.
+
+    :returns: The 8 bit RGBA image, top row first.
+    """
+    image = None
+    for path in paths:
+        with np.load(path) as tile:
+            pixels, (x, y) = tile["pixels"], tile["offset"]
+            if image is None:
+                width, height = tile["size"]
+                image = np.zeros((height, width, 4), dtype=np.uint8)
+            h = min(pixels.shape[0], image.shape[0] - y)
+            w = min(pixels.shape[1], image.shape[1] - x)
+            image[y : y + h, x : x + w] = pixels[:h, :w]
+    return image
+
+
+def write_stitched(paths, output):
+    """
+    Stitch the tiles into a PNG image at ``output`` and remove the tiles.
+    """
+    from ..animation.raster import write_png
+
+    write_png(output, stitch_tiles(paths))
+    for path in paths:
+        os.remove(path)
+    try:
+        os.rmdir(os.path.dirname(paths[0]))
+    except OSError:
+        pass
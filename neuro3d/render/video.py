@@ -0,0 +1,178 @@
+import os, shutil, struct, subprocess, threading
+from ..animation.raster import png_chunk
+from ..exceptions import *
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class VideoAssembler:
+    """
+    Streams rendered frames into a video encoder in frame order, while they are still
+    being rendered. Frames that complete out of order are buffered until all frames
+    before them are done or have failed.
+    """
+
+    def __init__(self, encoder, frames):
+        self.encoder = encoder
+        self._frames = sorted(frames)
+        self._next = 0
+        # Paths of the completed frames, or `None` for failed frames.
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.written = 0
+
+    def add(self, frame, path):
+        """
+        Add the image of a completed frame.
+        """
+        self._add(frame, path)
+
+    def skip(self, frame):
+        """
+        Leave out a frame that failed to render.
+        """
+        self._add(frame, None)
+
+    def _add(self, frame, path):
+        with self._lock:
+            self._pending[frame] = path
+            while self._next < len(self._frames) and self._frames[self._next] in self._pending:
+                self._write(self._pending.pop(self._frames[self._next]))
+                self._next += 1
+
+    def _write(self, path):
+        if path is not None:
+            self.encoder.write(path)
+            self.written += 1
+
+    def close(self):
+        """
+        Write the buffered frames that are left and finish the video.
+        """
+        with self._lock:
+            for frame in self._frames[self._next :]:
+                path = self._pending.pop(frame, None)
+                self._write(path)
+            self._next = len(self._frames)
+            self.encoder.close()
+
+
+class FFmpegEncoder:
+    """
+    Pipes the frame images into an ``ffmpeg`` process, which decodes them and encodes
+    the video in the format of the extension of ``path``.
+    """
+
+    def __init__(self, path, fps=24, options=("-pix_fmt", "yuv420p"), ffmpeg="ffmpeg"):
+        self.path = path
+        command = [
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "image2pipe", "-framerate", str(fps), "-i", "-",
+            *options, path,
+        ]
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, path):
+        with open(path, "rb") as f:
+            try:
+                shutil.copyfileobj(f, self._process.stdin)
+            except BrokenPipeError:
+                raise RenderError(f"ffmpeg stopped while encoding '{self.path}'.") from None
+
+    def close(self):
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        if self._process.wait():
+            raise RenderError(f"ffmpeg failed to encode '{self.path}'.")
+
+
+class APNGEncoder:
+    """
+    Pure Python fallback encoder that assembles PNG frames into an animated PNG. The
+    compressed image data of the frames is copied as is, so all frames must have the
+    same size and color type.
+    """
+
+    def __init__(self, path, fps=24):
+        self.path = path
+        self._fps = fps
+        self._file = open(path, "wb")
+        self._header = None
+        self._actl = None
+        self._sequence = 0
+        self._frames = 0
+
+    def write(self, path):
+        chunks = _read_png_chunks(path)
+        header = next(data for tag, data in chunks if tag == b"IHDR")
+        if self._header is None:
+            self._header = header
+            self._file.write(_PNG_SIGNATURE)
+            self._write_chunk(b"IHDR", header)
+            # The number of frames is patched in on close.
+            self._actl = self._file.tell()
+            self._write_chunk(b"acTL", struct.pack(">II", 0, 0))
+        elif header != self._header:
+            raise RenderError(f"Frame '{path}' does not match the size of the first frame.")
+        width, height = struct.unpack(">II", header[:8])
+        self._write_chunk(
+            b"fcTL",
+            struct.pack(
+                ">IIIIIHHBB", self._next_sequence(), width, height, 0, 0, 1, self._fps, 0, 0
+            ),
+        )
+        for tag, data in chunks:
+            if tag != b"IDAT":
+                continue
+            if self._frames:
+                self._write_chunk(b"fdAT", struct.pack(">I", self._next_sequence()) + data)
+            else:
+                self._write_chunk(b"IDAT", data)
+        self._frames += 1
+
+    def _next_sequence(self):
+        self._sequence += 1
+        return self._sequence - 1
+
+    def _write_chunk(self, tag, data):
+        self._file.write(png_chunk(tag, data))
+
+    def close(self):
+        if self._actl is not None:
+            self._write_chunk(b"IEND", b"")
+            self._file.seek(self._actl)
+            self._write_chunk(b"acTL", struct.pack(">II", self._frames, 0))
+        self._file.close()
+
+
+def create_encoder(path, fps=24):
+    """
+    Create an :class:`FFmpegEncoder` if ``ffmpeg`` can be found, otherwise an
+    :class:`APNGEncoder` that writes an ``.apng`` file next to ``path``.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is not None:
+        return FFmpegEncoder(path, fps, ffmpeg=ffmpeg)
+    root, ext = os.path.splitext(path)
+    if ext.lower() not in (".png", ".apng"):
+        path = root + ".apng"
+        print(f"ffmpeg not found, writing animated PNG to '{path}' instead.", flush=True)
+    return APNGEncoder(path, fps)
+
+
+def _read_png_chunks(path):
+    with open(path, "rb") as f:
+        content = f.read()
+    if not content.startswith(_PNG_SIGNATURE):
+        raise RenderError(f"'{path}' is not a PNG file.")
+    chunks = []
+    offset = len(_PNG_SIGNATURE)
+    while offset < len(content):
+        (length,) = struct.unpack_from(">I", content, offset)
+        tag = content[offset + 4 : offset + 8]
+        chunks.append((tag, content[offset + 8 : offset + 8 + length]))
+        offset += length + 12
+    return chunks
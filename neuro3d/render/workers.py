@@ -0,0 +1,129 @@
+import os, sys, hashlib, secrets, subprocess, threading
+from multiprocessing.connection import Listener
+from ..exceptions import *
+from . import BackendRender
+
+# Path of the worker script, executed by the worker processes.
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "_worker.py")
+
+
+class PersistentWorker:
+    """
+    A render worker process that loads the scene once and then renders the frames it
+    is sent over a local connection, to pay for the startup and scene load only once.
+    """
+
+    def __init__(self, backend_render, timeout=300):
+        authkey = secrets.token_bytes(16)
+        self._listener = Listener(("localhost", 0), authkey=authkey)
+        host, port = self._listener.address
+        command = backend_render.worker_command(host, port, authkey.hex())
+        self._process = subprocess.Popen(command)
+        self._conn = self._accept(timeout)
+
+    def _accept(self, timeout):
+        # `Listener.accept` can't time out, so wait for it in a thread while checking
+        # whether the worker process is still alive.
+        conn = []
+
+        def accept():
+            try:
+                conn.append(self._listener.accept())
+            except OSError:
+                pass
+
+        thread = threading.Thread(target=accept, daemon=True)
+        thread.start()
+        waited = 0
+        while thread.is_alive():
+            thread.join(0.1)
+            waited += 0.1
+            if self._process.poll() is not None or waited > timeout:
+                self._listener.close()
+                self._process.kill()
+                raise WorkerError("Render worker process did not connect.")
+        if not conn:
+            raise WorkerError("Render worker process did not connect.")
+        return conn[0]
+
+    def render(self, assignments):
+        """
+        Render a list of ``(frame, path)`` assignments.
+
+        :returns: A list of ``(frame, success, seconds, peak memory)`` results.
+        """
+        try:
+            self._conn.send(("render", list(assignments)))
+            return self._conn.recv()
+        except (EOFError, OSError) as e:
+            raise WorkerError(f"Render worker process died: {e}") from None
+
+    def close(self):
+        try:
+            self._conn.send(("stop",))
+        except (EOFError, OSError):
+            pass
+        self._conn.close()
+        self._listener.close()
+        try:
+            self._process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+
+
+class StubRender(BackendRender):
+    """
+    Renders placeholder files into a ``render`` folder next to ``file``, so that the
+    render pipeline can be used without a backend, e.g. in tests.
+    """
+
+    frame_range = (1, 10)
+    resolution = (64, 48)
+    delay = 0.0
+    # Content of the stub scene, the frames in `changed` depend on it.
+    content = ""
+    changed = ()
+
+    def render_portion(self, rank, size):
+        start, stop = self.frame_range
+        return self.render_frames(range(start + rank, stop + 1, size))
+
+    def render_frames(self, frames, log=None):
+        from ._worker import stub_frame_renderer
+
+        render_frame = stub_frame_renderer(self.delay)
+        for frame in frames:
+            render_frame(frame, self.get_output(frame))
+        return 0
+
+    def render_tile(self, frame, border, path):
+        import numpy as np
+
+        # A tile with a shade that depends on the position of the tile.
+        width, height = self.resolution
+        min_x, max_x, min_y, max_y = border
+        x0, x1 = int(min_x * width), int(max_x * width)
+        y0, y1 = height - int(max_y * height), height - int(min_y * height)
+        pixels = np.full((y1 - y0, x1 - x0, 4), 255, dtype=np.uint8)
+        pixels[..., 0] = frame % 256
+        pixels[..., 1] = int(min_x * 255)
+        pixels[..., 2] = int(min_y * 255)
+        np.savez(path, pixels=pixels, offset=(x0, y0), size=(width, height))
+
+    def get_output(self, frame):
+        root = os.path.dirname(os.path.abspath(self.file))
+        return os.path.join(root, "render", f"animation_{frame:04d}.png")
+
+    def get_frame_range(self):
+        return self.frame_range
+
+    def get_fingerprints(self, frames):
+        return {
+            f: hashlib.sha256(f"{f}:{self.content if f in self.changed else ''}".encode()).hexdigest()
+            for f in frames
+        }
+
+    def worker_command(self, host, port, authkey):
+        return self._pinned(
+            [sys.executable, WORKER_SCRIPT, "--", "stub", host, str(port), authkey, str(self.delay)]
+        )
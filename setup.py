@@ -36,7 +36,10 @@ setup(
         "errr"
     ],
     entry_points={
-        "neuro3d.backends": ["blender = neuro3d._blender.backend:BlenderBackend"]
+        "neuro3d.backends": [
+            "blender = neuro3d._blender.backend:BlenderBackend",
+            "numpy = neuro3d._numpy.backend:NumpyBackend",
+        ]
     },
     classifiers=[
         "Intended Audience :: Science/Research",